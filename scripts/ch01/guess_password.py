@@ -35,6 +35,10 @@ class GuessPasswordChromosome(Chromosome):
     def __eq__(self, other: GuessPasswordChromosome) -> bool:
         return self.genes == other.genes
 
+    def clone(self) -> GuessPasswordChromosome:
+        """Return a copy of the chromosome, the genes are a string so are shared."""
+        return GuessPasswordChromosome(self.genes, self.age)
+
 
 class GuessPasswordFitness(AbsoluteFitness):
     """Fitness function for the GuessPassword problem."""
@@ -72,10 +76,11 @@ class GuessPasswordMutation(Mutation):
 
     def __call__(self, parent):
         index = random.randrange(0, len(parent.genes))
-        child_genes = list(parent.genes)
         new_gene, alternate = random.sample(self.gene_set, 2)
-        child_genes[index] = alternate if new_gene == child_genes[index] else new_gene
-        genes = "".join(child_genes)
+        gene = alternate if new_gene == parent.genes[index] else new_gene
+        # the genes either side of the index are copied as slices, rather than
+        # splitting the string into a list of characters and joining it again
+        genes = parent.genes[:index] + gene + parent.genes[index + 1 :]
         return GuessPasswordChromosome(genes)
 
 
@@ -88,10 +93,15 @@ class GuessPasswordStoppingCriteria(StoppingCriteria):
     def optimal_fitness(self) -> float:
         return len(self.target)
 
-    def __call__(self, chromosome: GuessPasswordChromosome) -> bool:
+    def __call__(
+        self, chromosome: GuessPasswordChromosome, chromosome_fitness=None
+    ) -> bool:
         """Return true if can stop the genetic algorithm."""
 
-        return self.fitness(chromosome) >= len(self.target)
+        if chromosome_fitness is None:
+            chromosome_fitness = self.fitness(chromosome)
+
+        return chromosome_fitness >= len(self.target)
 
 
 class GuessPasswordChromosomeGenerator(ChromosomeGenerator):
@@ -127,10 +137,10 @@ class GuessPasswordRunner(Runner):
             fitness_stagnation_detector=fitness_stagnation_detector,
         )
 
-    def display(self, candidate):
+    def display(self, candidate, fitness):
         time_diff = time.time() - self.start_time
         logging.debug("genes=%s", candidate.genes)
-        logging.debug("fitness=%s", self.fitness(candidate))
+        logging.debug("fitness=%s", fitness)
         logging.debug("time=%.5f", time_diff)
 
 
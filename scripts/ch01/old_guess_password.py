@@ -76,10 +76,13 @@ class GuessPasswordStoppingCriteria(StoppingCriteria):
     def optimal_fitness(self) -> float:
         return len(self.target)
 
-    def __call__(self, chromosome: Chromosome) -> bool:
+    def __call__(self, chromosome: Chromosome, chromosome_fitness=None) -> bool:
         """Return true if can stop the genetic algorithm."""
 
-        return self.fitness(chromosome) >= len(self.target)
+        if chromosome_fitness is None:
+            chromosome_fitness = self.fitness(chromosome)
+
+        return chromosome_fitness >= len(self.target)
 
 
 class GuessPasswordChromosomeGenerator(ChromosomeGenerator):
@@ -109,9 +112,9 @@ class GuessPasswordRunner(Runner):
         self.stopping_criteria = stopping_criteria
         self.mutate = mutate
 
-    def display(self, candidate):
+    def display(self, candidate, fitness):
         timeDiff = time.time() - self.start_time
-        print("{}\t{}\t{}".format(candidate.genes, self.fitness(candidate), timeDiff))
+        print("{}\t{}\t{}".format(candidate.genes, fitness, timeDiff))
 
 
 def guess_password(target, gene_set) -> Chromosome:
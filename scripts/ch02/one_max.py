@@ -34,12 +34,16 @@ class OneMaxChromosome(Chromosome):
     def __eq__(self, other: OneMaxChromosome) -> bool:
         return self.genes == other.genes
 
+    def clone(self) -> OneMaxChromosome:
+        """Return a copy of the chromosome, the genes are a string so are shared."""
+        return OneMaxChromosome(self.genes, self.age)
+
 
 class OneMaxFitness(AbsoluteFitness):
     def __call__(self, chromosome: OneMaxChromosome) -> float:
-        logging.debug("Calculating fitness for %s", chromosome)
         fitness = chromosome.genes.count("1")
-        logging.debug("%s has fitness %.1f", chromosome, fitness)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("%s has fitness %.1f", chromosome, fitness)
         return fitness
 
 
@@ -50,23 +54,29 @@ class OneMaxMutation(Mutation):
 
     def __call__(self, parent):
 
-        logging.debug("- " * 30)
-        logging.debug("Mutating parent: %s", parent)
+        # called every iteration, so the debug logs are skipped unless enabled
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+        if debug:
+            logging.debug("- " * 30)
+            logging.debug("Mutating parent: %s", parent)
 
         index = random.randrange(0, len(parent.genes))
-        logging.debug("Index to mutate: %s", index)
 
-        child_genes = list(parent.genes)
         new_gene, alternate = random.sample(self.gene_set, 2)
-        logging.debug("New_gene: %d, alternate: %d", new_gene, alternate)
 
-        child_genes[index] = alternate if new_gene == child_genes[index] else new_gene
-        genes = "".join([str(X) for X in child_genes])
+        gene = alternate if new_gene == parent.genes[index] else new_gene
+        # the genes either side of the index are copied as slices, rather than
+        # splitting the string into a list of characters and joining it again
+        genes = parent.genes[:index] + str(gene) + parent.genes[index + 1 :]
         chromosome = OneMaxChromosome(genes)
-        logging.debug("Mutated child created: %s", chromosome)
 
-        logging.debug("Mutation complete")
-        logging.debug("- " * 30)
+        if debug:
+            logging.debug("Index to mutate: %s", index)
+            logging.debug("New_gene: %d, alternate: %d", new_gene, alternate)
+            logging.debug("Mutated child created: %s", chromosome)
+            logging.debug("Mutation complete")
+            logging.debug("- " * 30)
 
         return chromosome
 
@@ -80,8 +90,11 @@ class OneMaxStoppingCriteria(StoppingCriteria):
     def optimal_fitness(self) -> float:
         return self.target
 
-    def __call__(self, chromosome: OneMaxChromosome) -> bool:
-        return self.fitness(chromosome) >= self.target
+    def __call__(self, chromosome: OneMaxChromosome, chromosome_fitness=None) -> bool:
+        if chromosome_fitness is None:
+            chromosome_fitness = self.fitness(chromosome)
+
+        return chromosome_fitness >= self.target
 
 
 class OneMaxChromosomeGenerator(ChromosomeGenerator):
@@ -120,7 +133,7 @@ class OneMaxRunner(Runner):
             fitness_stagnation_detector,
         )
 
-    def display(self, candidate: OneMaxChromosome):
+    def display(self, candidate: OneMaxChromosome, fitness: float):
         time_diff = time.time() - self.start_time
         return f"time = {time_diff}"
 
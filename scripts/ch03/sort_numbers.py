@@ -35,22 +35,27 @@ class SortNumbersChromosome(Chromosome):
     def __eq__(self, other: Chromosome) -> bool:
         return self.genes == other.genes
 
+    def clone(self) -> SortNumbersChromosome:
+        """Return a copy of the chromosome with a copy of the genes."""
+        return SortNumbersChromosome(list(self.genes), self.age)
+
 
 class SortNumbersFitness(RelativeFitness):
     """Fitness function of a chromosome for the sort numbers problem."""
 
+    __slots__ = ("key",)
+
     def __init__(self, chromosome: SortNumbersChromosome) -> None:
         self.chromosome = chromosome
+        # more numbers in sequence is better, then smaller gaps. Both are found once
+        # here, rather than again for every comparison
+        self.key = (
+            self.numbers_in_sequence_count(),
+            -self.total_size_of_gaps_in_sequence(),
+        )
 
     def __gt__(self, other: SortNumbersFitness) -> bool:
-
-        if self.numbers_in_sequence_count() != other.numbers_in_sequence_count():
-            return self.numbers_in_sequence_count() > other.numbers_in_sequence_count()
-
-        return (
-            self.total_size_of_gaps_in_sequence()
-            < other.total_size_of_gaps_in_sequence()
-        )
+        return self.key > other.key
 
     def total_size_of_gaps_in_sequence(self) -> float:
         """Return the total size of the gaps in the sequence.
@@ -110,10 +115,15 @@ class SortNumbersStoppingCriteria(StoppingCriteria):
         self.target = target
         self.fitness = fitness
 
-    def __call__(self, chromosome: SortNumbersChromosome) -> bool:
+    def __call__(
+        self, chromosome: SortNumbersChromosome, chromosome_fitness=None
+    ) -> bool:
         """Return true if can stop the genetic algorithm."""
 
-        return self.fitness(chromosome).numbers_in_sequence_count() >= self.target
+        if chromosome_fitness is None:
+            chromosome_fitness = self.fitness(chromosome)
+
+        return chromosome_fitness.numbers_in_sequence_count() >= self.target
 
 
 class SortNumbersChromosomeGenerator(ChromosomeGenerator):
@@ -148,13 +158,11 @@ class SortNumbersRunner(Runner):
             fitness_stagnation_detector,
         )
 
-    def display(self, candidate):
+    def display(self, candidate, fitness: SortNumbersFitness):
         timeDiff = time.time() - self.start_time
 
-        numbers_in_sequence_count = self.fitness(candidate).numbers_in_sequence_count()
-        total_size_of_gaps_in_sequence = self.fitness(
-            candidate
-        ).total_size_of_gaps_in_sequence()
+        numbers_in_sequence_count = fitness.numbers_in_sequence_count()
+        total_size_of_gaps_in_sequence = fitness.total_size_of_gaps_in_sequence()
 
         print(
             "{}:\tIn sequence={}\tGap size={}\ttime={}".format(
@@ -15,7 +15,9 @@ from __future__ import annotations
 import logging
 import random
 import time
-from typing import List, Union
+from typing import Union
+
+import numpy as np
 
 from src.genetic import (
     AbsoluteFitness,
@@ -33,7 +35,7 @@ from src.genetic import (
 class EightQueensChromosome(Chromosome):
     """Chromosome for the OneMax problem is a string of 1s and 0s."""
 
-    def __init__(self, genes: List[int], age: int = 0):
+    def __init__(self, genes: np.ndarray, age: int = 0):
         self.genes = genes
         self.age = age
 
@@ -44,7 +46,11 @@ class EightQueensChromosome(Chromosome):
         return f"Chromosome({self.genes}, age={self.age})"
 
     def __eq__(self, other: EightQueensChromosome) -> bool:
-        return self.genes == other.genes
+        return np.array_equal(self.genes, other.genes)
+
+    def clone(self) -> EightQueensChromosome:
+        """Return a copy of the chromosome with a copy of the genes."""
+        return EightQueensChromosome(self.genes.copy(), self.age)
 
 
 class Board:
@@ -64,6 +70,11 @@ class Board:
             print(" ".join(self._board[i]))
 
 
+def count_distinct(values: np.ndarray) -> int:
+    """Return the number of distinct values in an array of non-negative integers."""
+    return np.count_nonzero(np.bincount(values))
+
+
 class EightQueensFitness(AbsoluteFitness):
     """Fitness function of a chromosome for the sort numbers problem."""
 
@@ -86,30 +97,18 @@ class EightQueensFitness(AbsoluteFitness):
             under attack). The higher the score, the better the fitness.
         """
 
-        board = Board(chromosome.genes, self.size)
-
-        rows_with_queens = set()
-        cols_with_queens = set()
-        north_east_diagonals_with_queens = set()
-        south_east_diagonals_with_queens = set()
-
-        for row in range(self.size):
-            for col in range(self.size):
-                if board.get(row, col) == "Q":
-                    rows_with_queens.add(row)
-                    cols_with_queens.add(col)
-                    north_east_diagonals_with_queens.add(row + col)
-                    south_east_diagonals_with_queens.add(self.size - 1 - row + col)
+        rows = chromosome.genes[0::2]
+        cols = chromosome.genes[1::2]
 
         total = -(
             self.size
-            - len(rows_with_queens)
+            - count_distinct(rows)
             + self.size
-            - len(cols_with_queens)
+            - count_distinct(cols)
             + self.size
-            - len(north_east_diagonals_with_queens)
+            - count_distinct(rows + cols)
             + self.size
-            - len(south_east_diagonals_with_queens)
+            - count_distinct(self.size - 1 - rows + cols)
         )
 
         return total
@@ -149,10 +148,15 @@ class EightQueensStoppingCriteria(StoppingCriteria):
         self.target = target
         self.fitness = fitness
 
-    def __call__(self, chromosome: EightQueensChromosome) -> bool:
+    def __call__(
+        self, chromosome: EightQueensChromosome, chromosome_fitness=None
+    ) -> bool:
         """Return true if can stop the genetic algorithm."""
 
-        return self.fitness(chromosome) >= self.target
+        if chromosome_fitness is None:
+            chromosome_fitness = self.fitness(chromosome)
+
+        return chromosome_fitness >= self.target
 
 
 class EightQueensChromosomeGenerator(ChromosomeGenerator):
@@ -172,7 +176,7 @@ class EightQueensChromosomeGenerator(ChromosomeGenerator):
         while len(genes) < self.length:
             sampleSize = min(self.length - len(genes), len(self.gene_set))
             genes.extend(random.sample(self.gene_set, sampleSize))
-        return EightQueensChromosome(genes)
+        return EightQueensChromosome(np.array(genes))
 
 
 class EightQueensRunner(Runner):
@@ -196,7 +200,7 @@ class EightQueensRunner(Runner):
         )
         self.size = size
 
-    def display(self, candidate: EightQueensChromosome):
+    def display(self, candidate: EightQueensChromosome, fitness):
         time_diff = time.time() - self.start_time
 
         board = Board(candidate.genes, self.size)
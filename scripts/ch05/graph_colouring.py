@@ -3,15 +3,15 @@ from __future__ import annotations
 import logging
 import random
 import time
-from copy import deepcopy
 from pathlib import Path
-from typing import Any, Tuple
+from typing import Any, List, Optional, Tuple
 
 import networkx as nx
+import numpy as np
 
 from src.genetic import (
-    AbsoluteFitness,
     AgeAnnealing,
+    BatchFitness,
     Chromosome,
     ChromosomeGenerator,
     FitnessStagnationDetector,
@@ -23,21 +23,33 @@ from src.genetic import (
 from src.graph import NodeColouredGraph
 
 
-class GraphColouringChromosome:
+class GraphColouringChromosome(Chromosome):
     """Chromosome for the graph colouring problem."""
 
     def __init__(self, genes: NodeColouredGraph, age: int = 0):
         self.genes = genes
         self.age = age
 
+    def __str__(self) -> str:
+        return str(self.genes.colour_dict)
 
-class GraphColoringFitness(AbsoluteFitness):
+    def __repr__(self) -> str:
+        return str(self.genes.colour_dict)
+
+    def clone(self) -> GraphColouringChromosome:
+        """Return a copy of the chromosome. Mutations only change the colours, so
+        the copy shares the edges of the graph."""
+        return GraphColouringChromosome(self.genes.copy_colours(), self.age)
+
+
+class GraphColoringFitness(BatchFitness):
     """Fitness function of a chromosome for the sort numbers problem."""
 
     chromosome: GraphColouringChromosome
 
-    def __init__(self) -> None:
-        pass
+    def __init__(self, base_graph: Optional[NodeColouredGraph] = None) -> None:
+        # every chromosome is a copy of the base graph, so its adjacency is built once
+        self.csr = None if base_graph is None else base_graph.to_csr()
 
     def __call__(self, chromosome: GraphColouringChromosome) -> int:
         """Return the fitness of a chromosome. The fitness is 0 minus the number of
@@ -55,11 +67,35 @@ class GraphColoringFitness(AbsoluteFitness):
             The fitness of the chromosome.
         """
 
-        return -sum(
-            [
-                chromosome.genes.node_colour_match(node1, node2)
-                for node1, node2 in chromosome.genes.edges
-            ]
+        return -chromosome.genes.count_colour_conflicts(self.csr)
+
+    def evaluate_batch(self, chromosomes: List[GraphColouringChromosome]) -> np.ndarray:
+        """Return the fitnesses of a batch of chromosomes with the same nodes and
+        edges. The colour ids of all the chromosomes are put in one array, so the
+        edges of every chromosome are compared in a single numpy operation. Ids are
+        only compared within a chromosome, so each can number its colours
+        differently.
+
+        Parameters
+        ----------
+        chromosomes : List[GraphColouringChromosome]
+            The chromosomes to evaluate.
+
+        Returns
+        -------
+        np.ndarray
+            The fitness of each chromosome.
+        """
+
+        csr = self.csr if self.csr is not None else chromosomes[0].genes.to_csr()
+
+        colour_ids = np.array(
+            [chromosome.genes.colour_ids(csr.nodes) for chromosome in chromosomes]
+        )
+        sources, targets = csr.edges
+
+        return -np.count_nonzero(
+            colour_ids[:, sources] == colour_ids[:, targets], axis=1
         )
 
 
@@ -69,14 +105,23 @@ class GraphColoringMutation(Mutation):
     def __init__(self, fitness: GraphColoringFitness, gene_set: GeneSet):
         self.fitness = fitness
         self.gene_set = gene_set
+        # the colours to choose from, listed once rather than on every mutation
+        self.colours = list(gene_set)
 
     def __call__(self, parent: GraphColouringChromosome) -> GraphColouringChromosome:
 
-        child = deepcopy(parent)
+        child = parent.clone()
+
+        # every chromosome has the nodes of the fitness's base graph, in the same
+        # order, so they are only listed when there is no base graph
+        if self.fitness.csr is not None:
+            nodes = self.fitness.csr.nodes
+        else:
+            nodes = list(child.genes.nodes)
 
         # pick a random node and a random colour
-        node = random.choice(list(child.genes.nodes))
-        new_colour = random.choice(list(self.gene_set))
+        node = random.choice(nodes)
+        new_colour = random.choice(self.colours)
 
         # mutate the node
         child.genes.nodes[node]["colour"] = new_colour
@@ -89,10 +134,15 @@ class GraphColoringStoppingCriteria(StoppingCriteria):
         self.target = target
         self.fitness = fitness
 
-    def __call__(self, chromosome: GraphColouringChromosome) -> bool:
+    def __call__(
+        self, chromosome: GraphColouringChromosome, chromosome_fitness=None
+    ) -> bool:
         """Return true if can stop the genetic algorithm."""
 
-        return self.fitness(chromosome) >= self.target
+        if chromosome_fitness is None:
+            chromosome_fitness = self.fitness(chromosome)
+
+        return chromosome_fitness >= self.target
 
 
 class GraphColoringChromosomeGenerator(ChromosomeGenerator):
@@ -102,15 +152,45 @@ class GraphColoringChromosomeGenerator(ChromosomeGenerator):
 
     def __call__(self) -> GraphColouringChromosome:
 
-        graph = deepcopy(self.base_graph)
+        graph = self.base_graph.copy_colours()
+        colours = list(self.gene_set)
 
         for node in graph.nodes:
-            random_colour = random.choice(list(self.gene_set))
+            random_colour = random.choice(colours)
             graph.nodes[node]["colour"] = random_colour
 
         return GraphColouringChromosome(graph, age=0)
 
 
+class GraphColoringDSaturChromosomeGenerator(ChromosomeGenerator):
+    """Generate a chromosome coloured greedily with the DSatur heuristic, which
+    often starts the genetic algorithm with few or no conflicts. If DSatur needs
+    more colours than the gene set has, its extra colours wrap round to the start
+    of the gene set, leaving those conflicts for the genetic algorithm to fix.
+    """
+
+    def __init__(self, gene_set, base_graph: NodeColouredGraph) -> None:
+        self.gene_set = gene_set
+        self.base_graph = base_graph
+
+    def __call__(self) -> GraphColouringChromosome:
+
+        graph = self.base_graph.copy_colours()
+        csr = graph.to_csr()
+        colours = list(self.gene_set)
+
+        colour_ids = csr.dsatur_colouring().tolist()
+        graph.set_node_attributes_bulk(
+            {
+                node: colours[colour_id % len(colours)]
+                for node, colour_id in zip(csr.nodes, colour_ids)
+            },
+            "colour",
+        )
+
+        return GraphColouringChromosome(graph, age=0)
+
+
 class GraphColoringRunner(Runner):
     def __init__(
         self,
@@ -130,11 +210,11 @@ class GraphColoringRunner(Runner):
             stagnation_detector,
         )
 
-    def display(self, candidate):
+    def display(self, candidate, fitness):
         time_diff = time.time() - self.start_time
 
-        logging.debug("candidate=%s", candidate.genes.colour_dict)
-        logging.debug("fitness=%s", self.fitness(candidate))
+        logging.debug("candidate=%s", candidate)
+        logging.debug("fitness=%s", fitness)
 
         logging.info("time=%f", time_diff)
 
@@ -144,12 +224,18 @@ def graph_colouring(
     gene_set: Tuple[str],
     fitness_stagnation_limit: Union[float, int] = float("inf"),
     age_limit: float = float("inf"),
+    dsatur_start: bool = False,
 ) -> GraphColouringChromosome:
 
     target = 0  # no edges with the same colour at each end
 
-    fitness = GraphColoringFitness()
-    chromosome_generator = GraphColoringChromosomeGenerator(gene_set, base_graph)
+    fitness = GraphColoringFitness(base_graph)
+    if dsatur_start:
+        chromosome_generator = GraphColoringDSaturChromosomeGenerator(
+            gene_set, base_graph
+        )
+    else:
+        chromosome_generator = GraphColoringChromosomeGenerator(gene_set, base_graph)
     stopping_criteria = GraphColoringStoppingCriteria(target, fitness)
     mutate = GraphColoringMutation(fitness, gene_set)
     age_annealing = AgeAnnealing(age_limit=age_limit)
@@ -166,7 +252,9 @@ def graph_colouring(
         fitness_stagnation_detector,
     )
 
+    # a DSatur colouring may already have no conflicts, in which case it is returned
     best = runner.run()
+
     print(best)
     return best
 
@@ -5,6 +5,7 @@ import pytest
 
 from scripts.ch05.graph_colouring import (
     GraphColoringChromosomeGenerator,
+    GraphColoringDSaturChromosomeGenerator,
     GraphColoringFitness,
     GraphColoringMutation,
     GraphColouringChromosome,
@@ -18,6 +19,11 @@ def simple_col_file(data_fixtures_folder):
     return data_fixtures_folder / "raw/graph_colouring/simple.col"
 
 
+@pytest.fixture
+def adjacent_states_col_file(data_fixtures_folder):
+    return data_fixtures_folder / "raw/graph_colouring/adjacent_states.col"
+
+
 def test_call_GraphColoringFitness():
 
     fitness = GraphColoringFitness()
@@ -37,6 +43,25 @@ def test_call_GraphColoringFitness():
     assert fitness(GraphColouringChromosome(graph)) == -2
 
 
+def test_evaluate_batch_GraphColoringFitness(simple_col_file):
+
+    random.seed(1)
+
+    base_graph = NodeColouredGraph().from_col_file(simple_col_file)
+    gene_set = ["red", "blue", "green"]
+
+    fitness = GraphColoringFitness(base_graph)
+    generator = GraphColoringChromosomeGenerator(gene_set, base_graph)
+    chromosomes = [generator() for _ in range(5)]
+
+    fitnesses = fitness.evaluate_batch(chromosomes)
+
+    assert fitnesses.tolist() == [fitness(chromosome) for chromosome in chromosomes]
+    assert GraphColoringFitness().evaluate_batch(chromosomes).tolist() == (
+        fitnesses.tolist()
+    )
+
+
 def test_call_GraphColoringMutation():
 
     random.seed(1)
@@ -82,6 +107,20 @@ def test_call_GraphColoringChromosomeGenerator():
     }
 
 
+def test_call_GraphColoringDSaturChromosomeGenerator(adjacent_states_col_file):
+
+    base_graph = NodeColouredGraph().from_col_file(adjacent_states_col_file)
+    gene_set = ["red", "blue", "green", "yellow"]
+
+    generator = GraphColoringDSaturChromosomeGenerator(gene_set, base_graph)
+
+    chromosome = generator()
+
+    assert set(chromosome.genes.colour_dict.values()) <= set(gene_set)
+    assert GraphColoringFitness(base_graph)(chromosome) == 0
+    assert set(base_graph.colour_dict.values()) == {None}
+
+
 def test_graph_colouring(simple_col_file):
 
     base_graph = NodeColouredGraph().from_col_file(simple_col_file)
@@ -90,3 +129,13 @@ def test_graph_colouring(simple_col_file):
 
     assert set(best.genes.colour_dict.values()) == set(gene_set)
     assert best.genes.colour_dict["4"] == best.genes.colour_dict["5"]
+
+
+def test_graph_colouring_dsatur_start(simple_col_file):
+
+    base_graph = NodeColouredGraph().from_col_file(simple_col_file)
+    gene_set = ["red", "blue", "green", "yellow"]
+    best = graph_colouring(base_graph, gene_set, dsatur_start=True)
+
+    assert GraphColoringFitness(base_graph)(best) == 0
+    assert best.genes.colour_dict["4"] == best.genes.colour_dict["5"]
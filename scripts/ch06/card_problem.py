@@ -10,7 +10,6 @@ from __future__ import annotations
 import logging
 import random
 import time
-from copy import deepcopy
 from pathlib import Path
 from typing import Any, List, Tuple, Type
 
@@ -42,6 +41,10 @@ class CardProblemChromosome(Chromosome):
     def __repr__(self) -> str:
         return self.__str__()
 
+    def clone(self) -> CardProblemChromosome:
+        """Return a copy of the chromosome with a copy of the genes."""
+        return CardProblemChromosome(list(self.genes), self.age)
+
     @property
     def left_group(self) -> List[int]:
         return self.genes[:5]
@@ -62,6 +65,8 @@ class CardProblemFitness(RelativeFitness):
     360.
     """
 
+    __slots__ = ()
+
     def __init__(self, chromosome: CardProblemChromosome) -> None:
         self.chromosome = chromosome
 
@@ -132,7 +137,7 @@ class CardProblemMutation(Mutation):
 
     def __call__(self, parent: CardProblemChromosome) -> CardProblemChromosome:
 
-        child = deepcopy(parent)
+        child = parent.clone()
 
         if len(child.genes) == len(set(child.genes)):
             count = random.randint(1, 4)
@@ -156,11 +161,16 @@ class CardProblemStoppingCriteria(StoppingCriteria):
         self.target = target
         self.fitness = fitness
 
-    def __call__(self, chromosome: CardProblemChromosome) -> bool:
+    def __call__(
+        self, chromosome: CardProblemChromosome, chromosome_fitness=None
+    ) -> bool:
         """Return true if can stop the genetic algorithm."""
 
-        return (self.fitness(chromosome).total_difference() == 0) and (
-            self.fitness(chromosome).count_duplicates() == 0
+        if chromosome_fitness is None:
+            chromosome_fitness = self.fitness(chromosome)
+
+        return (chromosome_fitness.total_difference() == 0) and (
+            chromosome_fitness.count_duplicates() == 0
         )
 
 
@@ -191,7 +201,7 @@ class CardProblemRunner(Runner):
             fitness_stagnation_detector,
         )
 
-    def display(self, candidate):
+    def display(self, candidate, fitness):
         time_diff = time.time() - self.start_time
 
         logging.debug("candidate=%s", candidate)
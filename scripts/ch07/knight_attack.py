@@ -12,6 +12,7 @@ from src.chess import Board, Knight, PiecePosition, PieceType
 from src.genetic import (
     AbsoluteFitness,
     AgeAnnealing,
+    Chromosome,
     ChromosomeGenerator,
     FitnessStagnationDetector,
     Mutation,
@@ -24,7 +25,7 @@ class GeneSet(Tuple[PiecePosition, ...]):
     """Gene set for the knight attack problem."""
 
 
-class KnightAttackChromosome:
+class KnightAttackChromosome(Chromosome):
     """Chromosome for the knight attack problem."""
 
     def __init__(self, genes: Board, age: int = 0) -> None:
@@ -98,10 +99,15 @@ class KnightAttackStoppingCriteria(StoppingCriteria):
         self.target = target
         self.fitness = fitness
 
-    def __call__(self, chromosome: KnightAttackChromosome) -> bool:
+    def __call__(
+        self, chromosome: KnightAttackChromosome, chromosome_fitness=None
+    ) -> bool:
         """Return true if can stop the genetic algorithm."""
 
-        return self.fitness(chromosome) == self.target
+        if chromosome_fitness is None:
+            chromosome_fitness = self.fitness(chromosome)
+
+        return chromosome_fitness == self.target
 
 
 class KnightAttackChromosomeGenerator(ChromosomeGenerator):
@@ -131,11 +137,11 @@ class KnightAttackRunner(Runner):
             fitness_stagnation_detector,
         )
 
-    def display(self, candidate):
+    def display(self, candidate, fitness):
         time_diff = time.time() - self.start_time
 
-        logging.debug("candidate=%s", str(candidate))
-        logging.info("fitness=%f", self.fitness(candidate))
+        logging.debug("candidate=%s", candidate)
+        logging.info("fitness=%f", fitness)
         logging.debug("time=%f", time_diff)
 
 
@@ -275,9 +275,15 @@ class MagicSquaresStoppingCriteria(StoppingCriteria):
         self.target = target
         self.fitness = fitness
 
-    def __call__(self, chromosome: MagicSquaresChromosome) -> bool:
+    def __call__(
+        self, chromosome: MagicSquaresChromosome, chromosome_fitness=None
+    ) -> bool:
         """Return true if can stop the genetic algorithm."""
-        return self.fitness(chromosome) >= self.target
+
+        if chromosome_fitness is None:
+            chromosome_fitness = self.fitness(chromosome)
+
+        return chromosome_fitness >= self.target
 
 
 class MagicSquaresChromosomeGenerator(ChromosomeGenerator):
@@ -316,11 +322,11 @@ class MagicSquaresRunner(Runner):
             fitness_stagnation_detector,
         )
 
-    def display(self, candidate):
+    def display(self, candidate, fitness):
         time_diff = time.time() - self.start_time
 
         logging.debug("candidate=%s", candidate)
-        logging.debug("fitness=%s", self.fitness(candidate))
+        logging.debug("fitness=%s", fitness)
         logging.info("time=%f", time_diff)
 
 
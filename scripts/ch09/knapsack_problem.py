@@ -167,8 +167,17 @@ class KnapsackChromosome(Chromosome):
 class KnapsackFitness(RelativeFitness):
     """Fitness function of the magic knapsack problem."""
 
+    __slots__ = ("key",)
+
     def __init__(self, chromosome: KnapsackChromosome) -> None:
         self.chromosome = chromosome
+        # each total is a sum over the genes, so they are found once here rather
+        # than again for every comparison
+        self.key = (
+            chromosome.total_value,
+            -chromosome.total_weight,
+            -chromosome.total_volume,
+        )
 
     def __gt__(self, other: KnapsackFitness) -> bool:
         """Return true if the fitness of the current chromosome is better than
@@ -178,14 +187,7 @@ class KnapsackFitness(RelativeFitness):
         knapsack. If the total weight is the same then the fitness is the total
         volume of the resources in the knapsack.
         """
-
-        if self.chromosome.total_value != other.chromosome.total_value:
-            return self.chromosome.total_value > other.chromosome.total_value
-
-        if self.chromosome.total_weight != other.chromosome.total_weight:
-            return self.chromosome.total_weight < other.chromosome.total_weight
-
-        return self.chromosome.total_volume < other.chromosome.total_volume
+        return self.key > other.key
 
 
 class KnapsackMutation(Mutation):
@@ -360,7 +362,7 @@ class KnapsackMutation(Mutation):
 class KnapsackStoppingCriteria(StoppingCriteria):
     """Stopping criteria for the magic squares problem."""
 
-    def __call__(self, chromosome: KnapsackChromosome) -> bool:
+    def __call__(self, chromosome: KnapsackChromosome, chromosome_fitness=None) -> bool:
         """Return true if can stop the genetic algorithm. In the knapsack problem
         the stopping criteria will be handled by the fitness stagnation detector
         """
@@ -416,7 +418,7 @@ class KnapsackRunner(Runner):
             fitness_stagnation_detector,
         )
 
-    def display(self, candidate):
+    def display(self, candidate, fitness):
         time_diff = time.time() - self.start_time
 
         logging.debug("candidate=%s", candidate)
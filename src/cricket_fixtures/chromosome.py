@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional, Set
+from dataclasses import dataclass, field
+from typing import Optional, Set, Tuple
 
 import numpy as np
 
@@ -98,12 +98,21 @@ class Fixture:
         ) or (self.home_team == other.away_team and self.away_team == other.home_team)
 
 
-@dataclass
+@dataclass(slots=True)
 class FixtureListChromosome(Chromosome):
-    """Chromosome for the cricket fixtures problem."""
+    """Chromosome for the cricket fixtures problem. When the chromosome is created by
+    a mutation, changed_weeks holds the (division_num, week_num) pairs which differ
+    from the parent, otherwise it is None.
+    """
 
     genes: np.ndarray
     age: int = 0
+    changed_weeks: Optional[Set[Tuple[int, int]]] = field(
+        default=None, compare=False, repr=False
+    )
+    num_divisions: int = field(init=False, compare=False, repr=False)
+    season_length_in_weeks: int = field(init=False, compare=False, repr=False)
+    max_games_per_week: int = field(init=False, compare=False, repr=False)
 
     def __post_init__(self):
         (
@@ -121,6 +130,35 @@ class FixtureListChromosome(Chromosome):
         """Return a visualisation of the chromosome."""
         return str(self.genes)
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FixtureListChromosome):
+            return NotImplemented
+        return self.age == other.age and np.array_equal(self.genes, other.genes)
+
+    def clone(self) -> FixtureListChromosome:
+        """Return a copy of the chromosome with a copy of the genes."""
+        return FixtureListChromosome(genes=self.genes.copy(), age=self.age)
+
+    @property
+    def teams(self) -> np.ndarray:
+        """A view of the home and away team numbers of each fixture."""
+        return self.genes[:, :, :, 0:2]
+
+    @property
+    def home_teams(self) -> np.ndarray:
+        """A view of the home team number of each fixture."""
+        return self.genes[:, :, :, 0]
+
+    @property
+    def away_teams(self) -> np.ndarray:
+        """A view of the away team number of each fixture."""
+        return self.genes[:, :, :, 1]
+
+    @property
+    def grounds(self) -> np.ndarray:
+        """A view of the ground number of each fixture."""
+        return self.genes[:, :, :, 2]
+
     @staticmethod
     def empty(
         num_divisions,
@@ -49,6 +49,7 @@ class FixtureListRunner(Runner):
         age_annealing: AgeAnnealing,
         fitness_stagnation_detector: FitnessStagnationDetector,
         report_writers: Sequence[ReportWriter],
+        cache_fitness: bool = False,
     ):
         super().__init__(
             chromosome_generator,
@@ -57,13 +58,14 @@ class FixtureListRunner(Runner):
             mutate,
             age_annealing,
             fitness_stagnation_detector,
+            cache_fitness=cache_fitness,
         )
         self.report_writers = report_writers
 
-    def display(self, candidate):
+    def display(self, candidate, fitness):
         # time_diff = time.time() - self.start_time
 
-        # logging.info("fitness=%s", self.fitness(candidate))
+        # logging.info("fitness=%s", fitness)
 
         for report_writer in self.report_writers:
             report_writer.write(candidate)
@@ -75,6 +77,7 @@ def cricket_fixtures_problem(
     output_folder: Path,
     fitness_stagnation_limit: Union[float, int] = float("inf"),
     age_limit: float = float("inf"),
+    cache_fitness: bool = False,
 ) -> FixtureListChromosome:
 
     target = 0  # all league fixture criteria are met
@@ -116,6 +119,7 @@ def cricket_fixtures_problem(
         age_annealing,
         fitness_stagnation_detector,
         report_writers,
+        cache_fitness=cache_fitness,
     )
 
     best = runner.run()
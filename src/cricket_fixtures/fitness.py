@@ -2,8 +2,7 @@ from __future__ import annotations
 
 import itertools
 from abc import abstractmethod
-from collections import Counter
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
@@ -16,12 +15,71 @@ MEDIUM_WEIGHT = 5
 LOW_WEIGHT = 1
 
 
+def count_repeats(values: np.ndarray) -> np.ndarray:
+    """Count the number of times non-zero values are repeated along the last axis,
+    i.e. the number of values minus the number of distinct values, ignoring zeros.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The values to count repeats in.
+
+    Returns
+    -------
+    np.ndarray
+        The number of repeats, with the last axis of values reduced.
+    """
+    values = np.sort(values, axis=-1)
+    return np.sum(
+        (values[..., 1:] == values[..., :-1]) & (values[..., 1:] != 0), axis=-1
+    )
+
+
+def teams_playing_by_week(team_nums: np.ndarray, num_teams: int) -> np.ndarray:
+    """Find which teams play in each week of each division.
+
+    Parameters
+    ----------
+    team_nums : np.ndarray
+        The team numbers playing in each week, with shape (num_divisions,
+        season_length_in_weeks, n). Zeros are empty slots.
+    num_teams : int
+        One more than the largest team number.
+
+    Returns
+    -------
+    np.ndarray
+        A boolean array with shape (num_divisions, season_length_in_weeks,
+        num_teams), True where the team plays in the week.
+    """
+    num_divisions, season_length_in_weeks, _ = team_nums.shape
+
+    playing = np.zeros((num_divisions, season_length_in_weeks, num_teams), dtype=bool)
+    playing[
+        np.arange(num_divisions)[:, None, None],
+        np.arange(season_length_in_weeks)[None, :, None],
+        team_nums,
+    ] = True
+
+    # zero is an empty slot rather than a team
+    playing[:, :, 0] = False
+
+    return playing
+
+
 class FixtureListGranularFitness(AbsoluteFitness):
     @abstractmethod
     def report(self, chromosome: FixtureListChromosome) -> List[str]:
         """Returns a list of strings that can be used to report on the fitness
         of the chromosome"""
 
+    def difference(
+        self, parent: FixtureListChromosome, child: FixtureListChromosome
+    ) -> float:
+        """Returns the change in fitness from a parent to a child mutated from it.
+        By default both chromosomes are evaluated in full."""
+        return self(child) - self(parent)
+
 
 class FitnessConfig(Dict[str, Tuple[float, FixtureListGranularFitness]]):
     """A dictionary of fitness functions and their weights"""
@@ -30,7 +88,7 @@ class FitnessConfig(Dict[str, Tuple[float, FixtureListGranularFitness]]):
 class TeamsPlayingMoreThanOnceInAWeek(FixtureListGranularFitness):
     """Counts the number of teams playing more than once in a week across the season"""
 
-    def __init__(self, db: Database):
+    def __init__(self, db: Optional[Database] = None):
         self.db = db
 
     def report(self, chromosome: FixtureListChromosome) -> List[str]:
@@ -72,8 +130,27 @@ class TeamsPlayingMoreThanOnceInAWeek(FixtureListGranularFitness):
 
         return lines
 
+    def difference(
+        self, parent: FixtureListChromosome, child: FixtureListChromosome
+    ) -> int:
+        """Only the weeks changed by the mutation are counted, as the count for each
+        week in a division is independent of the other weeks"""
+
+        return sum(
+            self.count_week(child, division_num, week_num)
+            - self.count_week(parent, division_num, week_num)
+            for division_num, week_num in child.changed_weeks
+        )
+
     @staticmethod
-    def __call__(chromosome: FixtureListChromosome) -> int:
+    def count_week(
+        chromosome: FixtureListChromosome, division_num: int, week_num: int
+    ) -> int:
+        """The number of extra times teams play in a week of a division"""
+
+        return int(count_repeats(chromosome.teams[division_num, week_num].ravel()))
+
+    def __call__(self, chromosome: FixtureListChromosome) -> int:
         """This is the number of teams playing more than once in a week. Counted
         across all weeks of the season
 
@@ -82,32 +159,17 @@ class TeamsPlayingMoreThanOnceInAWeek(FixtureListGranularFitness):
         int
             The number of teams playing more than once in a week across the season
         """
-        total_count = 0
-
-        for division in range(chromosome.num_divisions):
-
-            division_count = 0
-
-            for week_num in range(chromosome.season_length_in_weeks):
-
-                teams_playing_this_week = chromosome.genes[division, week_num, :, 0:2]
-
-                _, week_counts = np.unique(
-                    teams_playing_this_week[teams_playing_this_week != 0],
-                    return_counts=True,
-                )
-
-                division_count += np.sum(week_counts - 1)
-
-            total_count += division_count
+        teams = chromosome.teams.reshape(
+            chromosome.num_divisions, chromosome.season_length_in_weeks, -1
+        )
 
-        return total_count
+        return int(np.sum(count_repeats(teams)))
 
 
-class GroundClashes(AbsoluteFitness):
+class GroundClashes(FixtureListGranularFitness):
     """There cannot be two games at the same ground in a week"""
 
-    def __init__(self, db: Database):
+    def __init__(self, db: Optional[Database] = None):
         self.db = db
 
     def report(self, chromosome: FixtureListChromosome) -> List[str]:
@@ -141,21 +203,31 @@ class GroundClashes(AbsoluteFitness):
 
         return lines
 
-    @staticmethod
-    def __call__(chromosome: FixtureListChromosome) -> float:
+    def difference(
+        self, parent: FixtureListChromosome, child: FixtureListChromosome
+    ) -> float:
+        """Only the weeks changed by the mutation are counted, as the clashes in each
+        week are independent of the other weeks"""
 
-        total_count = 0
+        return sum(
+            self.count_week(child, week_num) - self.count_week(parent, week_num)
+            for week_num in {week_num for _, week_num in child.changed_weeks}
+        )
 
-        for week_num in range(chromosome.season_length_in_weeks):
+    @staticmethod
+    def count_week(chromosome: FixtureListChromosome, week_num: int) -> float:
+        """The number of extra times grounds are used in a week"""
 
-            grounds_used_in_week = chromosome.genes[:, week_num, :, 2]
-            grounds_used_in_week = grounds_used_in_week[grounds_used_in_week != 0]
+        return int(count_repeats(chromosome.grounds[:, week_num].ravel()))
 
-            _, ground_counts = np.unique(grounds_used_in_week, return_counts=True)
+    def __call__(self, chromosome: FixtureListChromosome) -> float:
 
-            total_count += sum(ground_counts - 1)
+        # group the grounds used by week across all divisions
+        grounds = np.swapaxes(chromosome.grounds, 0, 1).reshape(
+            chromosome.season_length_in_weeks, -1
+        )
 
-        return total_count
+        return int(np.sum(count_repeats(grounds)))
 
 
 class IncorrectNumberOfFixturesBetweenTwoTeams(AbsoluteFitness):
@@ -165,27 +237,34 @@ class IncorrectNumberOfFixturesBetweenTwoTeams(AbsoluteFitness):
     def __call__(chromosome: FixtureListChromosome) -> float:
         total_count = 0
 
+        num_teams = chromosome.teams.max() + 1
+
         for division_num in range(chromosome.num_divisions):
 
-            division_count = 0
+            home_teams = chromosome.home_teams[division_num].ravel()
+            away_teams = chromosome.away_teams[division_num].ravel()
 
-            fixtures_in_division = chromosome.genes[division_num, :, :, :2]
+            is_set = home_teams != 0
 
-            teams_in_division = np.unique(fixtures_in_division)
-            teams_in_division = teams_in_division[teams_in_division != 0]
+            # fixture_counts[team_1, team_2] is the number of times team_1 hosts team_2
+            fixture_counts = np.bincount(
+                home_teams[is_set] * num_teams + away_teams[is_set],
+                minlength=num_teams * num_teams,
+            ).reshape(num_teams, num_teams)
 
-            for team_1 in teams_in_division:
-                for team_2 in teams_in_division:
+            teams_in_division = np.unique(
+                np.concatenate((home_teams[is_set], away_teams[is_set]))
+            )
 
-                    if team_1 == team_2:
-                        continue
+            division_fixture_counts = fixture_counts[
+                np.ix_(teams_in_division, teams_in_division)
+            ]
 
-                    division_count += np.abs(
-                        np.sum(np.equal([team_1, team_2], fixtures_in_division).all(2))
-                        - 1
-                    )
+            is_pair = ~np.eye(len(teams_in_division), dtype=bool)
 
-        return total_count
+            total_count += np.sum(np.abs(division_fixture_counts[is_pair] - 1))
+
+        return int(total_count)
 
 
 class SameTeamsPlayingConsecutively(AbsoluteFitness):
@@ -194,111 +273,59 @@ class SameTeamsPlayingConsecutively(AbsoluteFitness):
     @staticmethod
     def __call__(chromosome: FixtureListChromosome) -> float:
 
-        total_count = 0
-
-        for division_num in range(chromosome.num_divisions):
-
-            division_count = 0
-
-            # count the number of consecutive fixtures between them
-            # if not 0, add to fitness
-            for week_1 in range(chromosome.season_length_in_weeks - 1):
-
-                week_2 = week_1 + 1
-
-                # get division fixtures in week 1
-                week_1_fixtures = chromosome.genes[division_num, week_1, :]
-
-                # get division fixtures in week 2
-                week_2_fixtures = chromosome.genes[division_num, week_2, :]
-
-                week_consecutive_fixtures = [
-                    [
-                        int(
-                            fixture_1[0] == fixture_2[1]
-                            and fixture_1[1] == fixture_2[0]
-                        )
-                        for fixture_1 in week_1_fixtures
-                        if fixture_1[0] != 0
-                    ]
-                    for fixture_2 in week_2_fixtures
-                    if fixture_2[0] != 0
-                ]
-
-                division_count += np.sum(week_consecutive_fixtures)
-
-            total_count += division_count
-
-        return total_count
+        # compare every fixture in a week with every fixture in the following week
+        home_teams_1 = chromosome.home_teams[:, :-1, :, None]
+        away_teams_1 = chromosome.away_teams[:, :-1, :, None]
+        home_teams_2 = chromosome.home_teams[:, 1:, None, :]
+        away_teams_2 = chromosome.away_teams[:, 1:, None, :]
+
+        return int(
+            np.sum(
+                (home_teams_1 == away_teams_2)
+                & (away_teams_1 == home_teams_2)
+                & (home_teams_1 != 0)
+                & (home_teams_2 != 0)
+            )
+        )
 
 
 class TeamHasMoreThanOneWeekOff(AbsoluteFitness):
     """A team does not have two weeks off in a row"""
 
     def __call__(self, chromosome: FixtureListChromosome) -> float:
-        total_count = 0
 
-        for division_num in range(chromosome.num_divisions):
-
-            division_count = self.count_teams_has_more_than_one_week_off_in_division(
-                chromosome, division_num
-            )
+        team_nums = chromosome.teams.reshape(
+            chromosome.num_divisions, chromosome.season_length_in_weeks, -1
+        )
 
-            total_count += division_count
+        playing = teams_playing_by_week(team_nums, team_nums.max() + 1)
 
-        return total_count
+        longest_team_breaks = self.count_longest_team_breaks(playing)
 
-    def count_teams_has_more_than_one_week_off_in_division(
-        self, chromosome, division_num
-    ):
+        # only count teams in the division
+        longest_team_breaks[~playing.any(axis=1)] = 0
 
-        division_count = 0
+        return int(np.sum(np.maximum(longest_team_breaks - 1, 0)))
 
-        # get unique teams in division
-        unique_teams_in_division = np.unique(chromosome.genes[division_num, :, :, 0:2])
+    @staticmethod
+    def count_longest_team_breaks(playing: np.ndarray) -> np.ndarray:
+        """Count the longest run of weeks each team does not play, from a boolean
+        array with shape (num_divisions, season_length_in_weeks, num_teams)"""
 
-        unique_teams_in_division = unique_teams_in_division[
-            unique_teams_in_division != 0
-        ]
+        longest_team_breaks = np.zeros((playing.shape[0], playing.shape[2]), dtype=int)
+        current_team_breaks = np.zeros_like(longest_team_breaks)
 
-        # for each team
-        for team in unique_teams_in_division:
+        for week_num in range(playing.shape[1]):
 
-            longest_team_break = self.count_longest_team_break(
-                chromosome, division_num, team
+            current_team_breaks = np.where(
+                playing[:, week_num], 0, current_team_breaks + 1
             )
 
-            if longest_team_break > 1:
-                division_count += longest_team_break - 1
-
-        return division_count
-
-    def count_longest_team_break(self, chromosome, division_num, team):
-        longest_team_break = 0
-        current_team_break = 0
-
-        for week_num in range(chromosome.season_length_in_weeks):
-
-            weekly_fixtures = chromosome.genes[division_num, week_num, :]
-
-            team_is_playing_in_week = any(
-                [
-                    fixture[0] == team or fixture[1] == team
-                    for fixture in weekly_fixtures
-                    if fixture[0] != 0
-                ]
+            np.maximum(
+                longest_team_breaks, current_team_breaks, out=longest_team_breaks
             )
 
-            if team_is_playing_in_week:
-                current_team_break = 0
-
-            else:
-                current_team_break += 1
-
-                if current_team_break > longest_team_break:
-                    longest_team_break = current_team_break
-
-        return longest_team_break
+        return longest_team_breaks
 
 
 class GroundUsedTwiceInARow(AbsoluteFitness):
@@ -307,27 +334,27 @@ class GroundUsedTwiceInARow(AbsoluteFitness):
     """
 
     def __call__(self, chromosome: FixtureListChromosome) -> float:
-        total_count = 0
-
-        for week_num_1 in range(chromosome.season_length_in_weeks - 1):
 
-            week_count = 0
+        season_length_in_weeks = chromosome.season_length_in_weeks
 
-            week_num_2 = week_num_1 + 1
-
-            week_1_grounds = chromosome.genes[:, week_num_1, :, 2].flatten()
-            week_2_grounds = chromosome.genes[:, week_num_2, :, 2].flatten()
+        grounds = np.swapaxes(chromosome.grounds, 0, 1).reshape(
+            season_length_in_weeks, -1
+        )
 
-            week_1_grounds = week_1_grounds[week_1_grounds != 0]
-            week_2_grounds = week_2_grounds[week_2_grounds != 0]
+        num_grounds = grounds.max() + 1
 
-            week_count = len(
-                list((Counter(week_1_grounds) & Counter(week_2_grounds)).elements())
-            )
+        # ground_counts[week_num, ground_num] is the times the ground is used in week
+        ground_counts = np.bincount(
+            (
+                np.arange(season_length_in_weeks)[:, None] * num_grounds + grounds
+            ).ravel(),
+            minlength=season_length_in_weeks * num_grounds,
+        ).reshape(season_length_in_weeks, num_grounds)
 
-            total_count += week_count
+        # zero is an empty slot rather than a ground
+        ground_counts[:, 0] = 0
 
-        return total_count
+        return int(np.sum(np.minimum(ground_counts[:-1], ground_counts[1:])))
 
 
 class TeamHasMoreThanTwoHomeGamesInARow(AbsoluteFitness):
@@ -335,71 +362,37 @@ class TeamHasMoreThanTwoHomeGamesInARow(AbsoluteFitness):
 
     def __call__(self, chromosome: FixtureListChromosome) -> float:
 
-        total_count = 0
-
-        for division_num in range(chromosome.num_divisions):
-
-            division_count = 0
-
-            # get unique teams in division
-            unique_teams_in_division = np.unique(
-                chromosome.genes[division_num, :, :, 0:2].flatten()
-            )
-
-            unique_teams_in_division = unique_teams_in_division[
-                unique_teams_in_division != 0
-            ]
+        num_teams = chromosome.teams.max() + 1
 
-            for team in unique_teams_in_division:
+        plays_at_home = teams_playing_by_week(chromosome.home_teams, num_teams)
+        plays_away = teams_playing_by_week(chromosome.away_teams, num_teams)
 
-                team_count = 0
-
-                most_consecutive_home_games = 0
-                current_consecutive_home_games = 0
-
-                for week_num in range(chromosome.season_length_in_weeks):
-
-                    # find all fixtures in division in week
-                    week_fixtures = [
-                        fixture
-                        for fixture in chromosome.genes[division_num, week_num, :]
-                        if fixture is not None
-                    ]
-
-                    # if team has a home fixture
-                    team_has_home_fixture = team in [
-                        fixture[0] for fixture in week_fixtures
-                    ]
-
-                    # if team has a away fixture
-                    team_has_away_fixture = team in [
-                        fixture[1] for fixture in week_fixtures
-                    ]
-
-                    if team_has_home_fixture:
-                        current_consecutive_home_games += 1
-
-                        if current_consecutive_home_games > most_consecutive_home_games:
-                            most_consecutive_home_games = current_consecutive_home_games
-
-                    elif team_has_away_fixture:
-                        current_consecutive_home_games = 0
-                    else:
-                        # team has no fixture in week
-                        pass
+        most_consecutive_home_games = np.zeros(
+            (chromosome.num_divisions, num_teams), dtype=int
+        )
+        current_consecutive_home_games = np.zeros_like(most_consecutive_home_games)
 
-                if most_consecutive_home_games > 2:
-                    team_count += most_consecutive_home_games - 2
+        for week_num in range(chromosome.season_length_in_weeks):
 
-                division_count += team_count
+            # a week with no fixture does not break the run of home games
+            current_consecutive_home_games = np.where(
+                plays_at_home[:, week_num],
+                current_consecutive_home_games + 1,
+                np.where(plays_away[:, week_num], 0, current_consecutive_home_games),
+            )
 
-            total_count += division_count
+            np.maximum(
+                most_consecutive_home_games,
+                current_consecutive_home_games,
+                out=most_consecutive_home_games,
+            )
 
-        return total_count
+        return int(np.sum(np.maximum(most_consecutive_home_games - 2, 0)))
 
 
 class FixtureListFitness(AbsoluteFitness):
-    """Fitness function for a fixture list chromosome"""
+    """Fitness function for a fixture list chromosome. Fitnesses are not cached here,
+    the runner caches them if cache_fitness is set."""
 
     chromosome: FixtureListChromosome
 
@@ -407,6 +400,13 @@ class FixtureListFitness(AbsoluteFitness):
 
         self.fitness_config = fitness_config
 
+        # the change in fitness from a mutation can only be found from the changed
+        # weeks if every granular fitness can find its own difference
+        self.supports_difference = all(
+            hasattr(fitness_fn, "difference")
+            for _, fitness_fn in fitness_config.values()
+        )
+
         self.unique_teams_in_division = [
             db.get_team_nums_in_division(division_num)
             for division_num in db.division_nums()
@@ -449,8 +449,8 @@ class FixtureListFitness(AbsoluteFitness):
         }
 
     def __call__(self, chromosome: FixtureListChromosome) -> float:
-        """Return the fitness of a chromosome. The fitness is the absolute difference
-        between the sum of the rows, columns, and diagonals and the expected sum.
+        """Return the fitness of a chromosome. The fitness is the negative weighted sum
+        of the granular fitnesses.
 
         Parameters
         ----------
@@ -469,3 +469,39 @@ class FixtureListFitness(AbsoluteFitness):
                 for weight, fitness_fn in self.fitness_config.values()
             ]
         )
+
+    def delta(
+        self,
+        parent_fitness: float,
+        parent: FixtureListChromosome,
+        child: FixtureListChromosome,
+    ) -> float:
+        """Return the fitness of a child mutated from the parent, from the change in
+        each granular fitness. The child is evaluated in full if the weeks changed
+        by the mutation are not known, or if any of the granular fitnesses can't find
+        the difference between a parent and a child.
+
+        Parameters
+        ----------
+        parent_fitness : float
+            The fitness of the parent.
+        parent : FixtureListChromosome
+            The parent the child was mutated from.
+        child : FixtureListChromosome
+            The chromosome to evaluate.
+
+        Returns
+        -------
+        float
+            The fitness of the child.
+        """
+
+        if child.changed_weeks is None or not self.supports_difference:
+            return self(child)
+
+        return parent_fitness - sum(
+            [
+                weight * fitness_fn.difference(parent, child)
+                for weight, fitness_fn in self.fitness_config.values()
+            ]
+        )
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import copy
 import logging
 import random
 from abc import abstractmethod
@@ -34,7 +33,8 @@ class FixtureListMutation(Mutation):
             The mutated chromosome.
         """
 
-        copy_of_parent = copy.deepcopy(parent)
+        copy_of_parent = parent.clone()
+        copy_of_parent.changed_weeks = set()
         return self.mutate(copy_of_parent)
 
     def choose_two_fixtures(self, child):
@@ -53,24 +53,29 @@ class FixtureListMutation(Mutation):
 
         return week_num_1, game_num_1, week_num_2, game_num_2
 
-    @staticmethod
-    def choose_random_week(child):
-        return random.randint(0, child.season_length_in_weeks - 1)
+    def choose_random_week(self, child):
+        return int(random.random() * child.season_length_in_weeks)
 
-    @staticmethod
-    def choose_random_game(child):
-        return random.randint(0, child.max_games_per_week - 1)
+    def choose_random_game(self, child):
+        return int(random.random() * child.max_games_per_week)
 
     @staticmethod
     def swap_two_fixtures(
         division_num, week_num_1, week_num_2, game_num_1, game_num_2, child
     ):
 
-        fixture_1 = np.copy(child.genes[division_num, week_num_1, game_num_1, :])
-        fixture_2 = np.copy(child.genes[division_num, week_num_2, game_num_2, :])
+        week_nums = [week_num_1, week_num_2]
+        game_nums = [game_num_1, game_num_2]
 
-        child.genes[division_num, week_num_1, game_num_1, :] = fixture_2
-        child.genes[division_num, week_num_2, game_num_2, :] = fixture_1
+        # the right hand side is gathered before assignment, so this swaps in place
+        child.genes[division_num, week_nums, game_nums] = child.genes[
+            division_num, week_nums[::-1], game_nums[::-1]
+        ]
+
+        if child.changed_weeks is not None:
+            child.changed_weeks.update(
+                ((division_num, week_num_1), (division_num, week_num_2))
+            )
 
         return child
 
@@ -83,6 +88,8 @@ class SwapUpToNFixturesMutation(FixtureListMutation):
 
     def mutate(self, chromosome: FixtureListChromosome) -> FixtureListChromosome:
 
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+
         # for each division
         divisions = random.sample(
             range(chromosome.num_divisions),
@@ -101,13 +108,14 @@ class SwapUpToNFixturesMutation(FixtureListMutation):
                     game_num_2,
                 ) = self.choose_two_fixtures(chromosome)
 
-                logging.debug(
-                    "Swapping week {%d}, game {%d} with week {%d}, game {%d}",
-                    week_num_1,
-                    game_num_1,
-                    week_num_2,
-                    game_num_2,
-                )
+                if debug:
+                    logging.debug(
+                        "Swapping week {%d}, game {%d} with week {%d}, game {%d}",
+                        week_num_1,
+                        game_num_1,
+                        week_num_2,
+                        game_num_2,
+                    )
 
                 chromosome = self.swap_two_fixtures(
                     division_num,
@@ -139,6 +147,13 @@ class TheNicolaSwitchProcesserMutation(FixtureListMutation):
                 chromosome, division_num
             )
 
+            if len(team_nums) == 0:
+                continue
+
+            # the genes are not changed until the swap, so these are found once
+            playing = self.count_teams_in_division(chromosome, division_num) > 0
+            empty_slots = chromosome.home_teams[division_num] == 0
+
             for zip_ in zip(team_nums, week_nums):
 
                 team_num, week_num = zip_
@@ -152,51 +167,38 @@ class TheNicolaSwitchProcesserMutation(FixtureListMutation):
 
                 for ii, duplicate_fixture in enumerate(duplicate_fixtures):
 
-                    for other_week_num in range(chromosome.season_length_in_weeks):
-
-                        if other_week_num == week_num:
-                            continue
-
-                        if self.team_plays_in_week(
-                            chromosome,
-                            division_num,
-                            other_week_num,
-                            duplicate_fixture[0],
-                        ):
-                            continue
-
-                        if self.team_plays_in_week(
-                            chromosome,
-                            division_num,
-                            other_week_num,
-                            duplicate_fixture[1],
-                        ):
-                            continue
-
-                        for other_game_num in range(chromosome.max_games_per_week):
-
-                            if (
-                                chromosome.genes[
-                                    division_num, other_week_num, other_game_num, 0
-                                ]
-                                != 0
-                            ):
-                                continue
-
-                            chromosome = self.swap_two_fixtures(
-                                division_num,
-                                week_num,
-                                other_week_num,
-                                game_nums[ii],
-                                other_game_num,
-                                chromosome,
-                            )
-
-                            return chromosome
+                    other_week_nums = self.find_free_weeks(
+                        playing, empty_slots, week_num, duplicate_fixture
+                    )
+
+                    if len(other_week_nums) == 0:
+                        continue
+
+                    other_week_num = other_week_nums[0]
+                    other_game_num = np.argmax(empty_slots[other_week_num])
+
+                    chromosome = self.swap_two_fixtures(
+                        division_num,
+                        week_num,
+                        other_week_num,
+                        game_nums[ii],
+                        other_game_num,
+                        chromosome,
+                    )
+
+                    return chromosome
         return chromosome
 
-    def team_plays_in_week(self, chromosome, division_num, week_num, team_num):
-        return np.any(chromosome.genes[division_num, week_num, :, 0:2] == team_num)
+    @staticmethod
+    def find_free_weeks(playing, empty_slots, week_num, fixture):
+        """Return the weeks, other than week_num, which have an empty slot and where
+        neither team in the fixture plays"""
+
+        free_weeks = ~playing[:, fixture[0]] & ~playing[:, fixture[1]]
+        free_weeks &= empty_slots.any(axis=1)
+        free_weeks[week_num] = False
+
+        return np.flatnonzero(free_weeks)
 
     def find_duplicate_fixtures(self, chromosome, division_num, week_num, team_num):
         return (
@@ -217,31 +219,43 @@ class TheNicolaSwitchProcesserMutation(FixtureListMutation):
 
     def highlight_duplicate_in_division(self, chromosome, division_num):
 
-        unique_teams = np.unique(chromosome.genes[division_num, :, :, 0:2])
-        unique_teams = unique_teams[unique_teams != 0]
+        team_counts = self.count_teams_in_division(chromosome, division_num)
+
+        # ordered by week, then by team
+        week_nums, team_nums = np.nonzero(team_counts > 1)
 
-        team_nums = []
-        week_nums = []
+        return team_nums, week_nums
 
-        for week_num in range(chromosome.season_length_in_weeks):
+    def count_teams_in_division(self, chromosome, division_num):
+        """Return an array with shape (season_length_in_weeks, num_teams) of the
+        number of times each team plays in each week of the division"""
 
-            teams_playing_this_week = chromosome.genes[division_num, week_num, :, 0:2]
+        season_length_in_weeks = chromosome.season_length_in_weeks
+        num_teams = chromosome.teams.max() + 1
 
-            week_team_nums, week_counts = np.unique(
-                teams_playing_this_week[teams_playing_this_week != 0],
-                return_counts=True,
-            )
+        # count each (week, team) pair in a single bincount
+        pair_nums = chromosome.teams[division_num] + self.week_offsets(
+            season_length_in_weeks, chromosome.max_games_per_week, num_teams
+        )
 
-            week_team_nums = week_team_nums[week_counts > 1]
-            week_counts = week_counts[week_counts > 1]
+        team_counts = np.bincount(
+            pair_nums.ravel(), minlength=season_length_in_weeks * num_teams
+        ).reshape(season_length_in_weeks, num_teams)
 
-            # if can't find any duplicates, skip to next week
-            if len(week_counts) == 0:
-                continue
+        # zero is an empty slot rather than a team
+        team_counts[:, 0] = 0
 
-            # if can find duplicates, find the teams that are playing more than once
-            for team_num in week_team_nums:
-                team_nums.append(team_num)
-                week_nums.append(week_num)
+        return team_counts
 
-        return team_nums, week_nums
+    @staticmethod
+    def week_offsets(
+        season_length_in_weeks: int, max_games_per_week: int, num_teams: int
+    ) -> np.ndarray:
+        """Return the offsets added to the team numbers of each week so that each
+        (week, team) pair has a distinct number. This is a broadcast view of a single
+        arange, so is cheap enough to create on every call."""
+
+        return np.broadcast_to(
+            np.arange(season_length_in_weeks)[:, None, None] * num_teams,
+            (season_length_in_weeks, max_games_per_week, 2),
+        )
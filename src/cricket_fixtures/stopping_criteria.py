@@ -10,6 +10,12 @@ class FixtureListStoppingCriteria(StoppingCriteria):
         self.target = target
         self.fitness = fitness
 
-    def __call__(self, chromosome: FixtureListChromosome) -> bool:
+    def __call__(
+        self, chromosome: FixtureListChromosome, chromosome_fitness=None
+    ) -> bool:
         """Return true if can stop the genetic algorithm."""
-        return self.fitness(chromosome) >= self.target
+
+        if chromosome_fitness is None:
+            chromosome_fitness = self.fitness(chromosome)
+
+        return chromosome_fitness >= self.target
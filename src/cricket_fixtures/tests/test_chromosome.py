@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 
 from src.cricket_fixtures.chromosome import (
     Division,
@@ -250,3 +251,68 @@ def test_add_fixture():
             fixture.ground.ground_num,
         ],
     )
+
+
+def test_lanes_FixtureListChromosome():
+    """GIVEN a FixtureList with a fixture
+    WHEN the teams, home teams, away teams and grounds are queried
+    THEN views of the genes are returned, so writes to the genes are seen.
+    """
+    fixture_list = FixtureListChromosome.empty(2, 3, 2)
+
+    fixture_list.genes[1, 2, 0] = [4, 5, 6]
+
+    assert np.array_equal(fixture_list.teams[1, 2, 0], [4, 5])
+    assert fixture_list.home_teams[1, 2, 0] == 4
+    assert fixture_list.away_teams[1, 2, 0] == 5
+    assert fixture_list.grounds[1, 2, 0] == 6
+
+    for lane in (
+        fixture_list.teams,
+        fixture_list.home_teams,
+        fixture_list.away_teams,
+        fixture_list.grounds,
+    ):
+        assert np.shares_memory(lane, fixture_list.genes)
+
+
+def test_eq_FixtureListChromosome():
+    """GIVEN FixtureLists with the same or different genes
+    WHEN they are compared
+    THEN they are equal only if the genes and age are equal.
+    """
+    fixture_list_1 = FixtureListChromosome.empty(2, 3, 2)
+    fixture_list_2 = FixtureListChromosome.empty(2, 3, 2)
+
+    assert fixture_list_1 == fixture_list_2
+
+    fixture_list_2.genes[1, 2, 0] = [4, 5, 6]
+    assert fixture_list_1 != fixture_list_2
+
+    fixture_list_1.genes[1, 2, 0] = [4, 5, 6]
+    fixture_list_1.age = 1
+    assert fixture_list_1 != fixture_list_2
+
+
+def test_eq_FixtureListChromosome_other_type():
+    """GIVEN a FixtureList and an object which is not a FixtureList
+    WHEN they are compared
+    THEN they are not equal.
+    """
+    fixture_list = FixtureListChromosome.empty(2, 3, 2)
+
+    assert fixture_list != str(fixture_list)
+    assert fixture_list != None
+
+
+def test_slots_FixtureListChromosome():
+    """GIVEN a FixtureListChromosome
+    WHEN a new attribute is set
+    THEN an AttributeError is raised as the attributes are stored in slots.
+    """
+    fixture_list = FixtureListChromosome.empty(2, 3, 2)
+
+    assert not hasattr(fixture_list, "__dict__")
+
+    with pytest.raises(AttributeError):
+        fixture_list.not_an_attribute = 1
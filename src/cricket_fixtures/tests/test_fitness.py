@@ -1,8 +1,14 @@
+import random
+
 import numpy as np
 import pytest
 
 from src.cricket_fixtures.chromosome import FixtureListChromosome
+from src.cricket_fixtures.database import Database
 from src.cricket_fixtures.fitness import (
+    HIGH_WEIGHT,
+    LOW_WEIGHT,
+    FixtureListFitness,
     GroundClashes,
     GroundUsedTwiceInARow,
     IncorrectNumberOfFixturesBetweenTwoTeams,
@@ -11,6 +17,8 @@ from src.cricket_fixtures.fitness import (
     TeamHasMoreThanTwoHomeGamesInARow,
     TeamsPlayingMoreThanOnceInAWeek,
 )
+from src.cricket_fixtures.mutation import SwapUpToNFixturesMutation
+from src.genetic import FitnessCache
 
 
 def get_two_team_one_division_fixture_list_chromosome():
@@ -84,6 +92,24 @@ def get_three_team_one_division_fixture_list_chromosome():
     return FixtureListChromosome(genes=genes)
 
 
+def get_two_team_one_division_repeated_fixture_list_chromosome():
+    """A fixture for a two team fixture list chromosome where one team hosts the
+    other in every week"""
+
+    genes = np.array(
+        [
+            [
+                [[1, 2, 1]],
+                [[1, 2, 1]],
+                [[1, 2, 1]],
+            ]
+        ]
+    )
+
+    assert genes.shape == (1, 3, 1, 3)
+    return FixtureListChromosome(genes=genes)
+
+
 @pytest.mark.parametrize(
     "chromosome,expected_fitness",
     [
@@ -110,6 +136,7 @@ def test_call_GroundClashes(chromosome, expected_fitness):
         (get_two_team_one_division_fixture_list_chromosome(), 0),
         (get_two_team_one_division_with_zeros_fixture_list_chromosome(), 0),
         (get_two_team_two_division_fixture_list_chromosome(), 0),
+        (get_two_team_one_division_repeated_fixture_list_chromosome(), 3),
     ],
 )
 def test_call_IncorrectNumberOfFixturesBetweenTwoTeams(chromosome, expected_fitness):
@@ -185,3 +212,106 @@ def test_call_GroundUsedTwiceInARow(chromosome, expected_fitness):
 def test_call_TeamHasMoreThanTwoHomeGamesInARow(chromosome, expected_fitness):
     fitness = TeamHasMoreThanTwoHomeGamesInARow()
     assert fitness(chromosome) == expected_fitness
+
+
+@pytest.fixture(name="single_division_fitness")
+def fixture_single_division_fitness(data_fixtures_folder) -> FixtureListFitness:
+    """Fixture to create a fixture list fitness for a single division."""
+
+    db = Database(
+        data_fixtures_folder / "raw/cricket_fixtures/single_division_unique_grounds.csv"
+    )
+
+    fitness_config = {
+        "teams_playing_more_than_once_in_a_week": (
+            HIGH_WEIGHT,
+            TeamsPlayingMoreThanOnceInAWeek(db),
+        ),
+        "ground_clashes": (LOW_WEIGHT, GroundClashes(db)),
+    }
+
+    return FixtureListFitness(db, fitness_config)
+
+
+def test_call_FixtureListFitness_cache(single_division_fitness):
+    """GIVEN a fixture list fitness wrapped in a cache of size 2
+    WHEN chromosomes are evaluated
+    THEN chromosomes with the same genes share a cache entry, and the least recently
+    used entry is evicted when the cache is full.
+    """
+
+    chromosome_1 = get_three_team_one_division_fixture_list_chromosome()
+    chromosome_2 = get_two_team_one_division_fixture_list_chromosome()
+    chromosome_3 = get_two_team_one_division_with_zeros_fixture_list_chromosome()
+
+    single_division_fitness = FitnessCache(single_division_fitness, cache_size=2)
+
+    fitness = single_division_fitness(chromosome_1)
+    assert (
+        single_division_fitness(get_three_team_one_division_fixture_list_chromosome())
+        == fitness
+    )
+    assert len(single_division_fitness.cache) == 1
+
+    single_division_fitness(chromosome_2)
+    single_division_fitness(chromosome_3)
+
+    assert len(single_division_fitness.cache) == 2
+    assert single_division_fitness.cache_key(chromosome_1) not in (
+        single_division_fitness.cache
+    )
+
+    single_division_fitness.cache_clear()
+    assert len(single_division_fitness.cache) == 0
+
+
+def test_delta_FixtureListFitness(single_division_fitness):
+    """GIVEN a fixture list fitness and a parent chromosome
+    WHEN a child is mutated from the parent
+    THEN the fitness of the child from the changed weeks matches its full fitness.
+    """
+
+    random.seed(1)
+
+    parent = get_three_team_one_division_fixture_list_chromosome()
+    mutation = SwapUpToNFixturesMutation(2)
+
+    for _ in range(20):
+        child = mutation(parent)
+
+        child_fitness = single_division_fitness.delta(
+            single_division_fitness(parent), parent, child
+        )
+
+        assert child_fitness == single_division_fitness(child)
+
+        parent = child
+
+
+def test_delta_FixtureListFitness_without_difference(data_fixtures_folder):
+    """GIVEN a fixture list fitness with a granular fitness which has no difference
+    WHEN a child is mutated from the parent
+    THEN the fitness of the child is evaluated in full.
+    """
+
+    random.seed(1)
+
+    db = Database(
+        data_fixtures_folder / "raw/cricket_fixtures/single_division_unique_grounds.csv"
+    )
+
+    fitness_config = {
+        "ground_clashes": (LOW_WEIGHT, GroundClashes(db)),
+        "same_teams_playing_consecutively": (
+            HIGH_WEIGHT,
+            SameTeamsPlayingConsecutively(),
+        ),
+    }
+
+    fitness = FixtureListFitness(db, fitness_config)
+
+    parent = get_three_team_one_division_fixture_list_chromosome()
+    child = SwapUpToNFixturesMutation(2)(parent)
+
+    assert not fitness.supports_difference
+    assert fitness.delta(fitness(parent), parent, child) == fitness(child)
@@ -1,8 +1,5 @@
 from __future__ import annotations
 
-import copy
-import sys
-
 from tqdm import tqdm
 
 # File: genetic.py
@@ -23,17 +20,32 @@ from tqdm import tqdm
 # permissions and limitations under the License.
 
 
-print(sys.path)
-
-
 import logging
+import multiprocessing
 import random
 import time
 from abc import ABC, abstractmethod
-from bisect import bisect_left
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
 from copy import deepcopy
+from enum import Enum
+from functools import partial
+from hashlib import blake2b
+from itertools import accumulate
 from math import exp
-from typing import Any, List, Optional, Protocol, Tuple, Type, Union
+from typing import Any, Callable, Hashable, List, Optional, Protocol, Tuple, Union
+
+import numpy as np
+
+FITNESS_CACHE_SIZE = 65536
+
+logger = logging.getLogger(__name__)
+
+# logged at the end of each iteration to separate the debug logs of each iteration
+SEPARATOR = "= " * 30
+
+# the progress bar is updated every this many iterations rather than every iteration
+PROGRESS_BAR_INTERVAL = 100
 
 
 class Gene(Protocol):
@@ -41,7 +53,11 @@ class Gene(Protocol):
 
 
 class Chromosome(Protocol):
-    """Chromosome for the genetic algorithm."""
+    """Chromosome for the genetic algorithm. Chromosomes are created on every
+    iteration, so genes and age are stored in slots rather than a __dict__.
+    """
+
+    __slots__ = ("genes", "age")
 
     genes: Any
     age: int
@@ -54,6 +70,12 @@ class Chromosome(Protocol):
     def __repr__(self) -> str:
         """Return a string representation of the chromosome."""
 
+    def clone(self) -> Chromosome:
+        """Return a copy of the chromosome which can be changed without changing
+        this one. By default this is a deep copy, chromosomes with simple genes
+        should override this with a cheaper copy."""
+        return deepcopy(self)
+
 
 class GeneSet(Protocol):
     """Gene set for the genetic algorithm."""
@@ -66,6 +88,8 @@ class Generation:
 class Fitness(ABC):
     """Fitness is the abstract base class for fitness functions."""
 
+    __slots__ = ()
+
 
 class AbsoluteFitness(Fitness):
     """AbsoluteFitness is a fitness function that returns the absolute value
@@ -76,9 +100,236 @@ class AbsoluteFitness(Fitness):
     def __call__(self, chromosome: Chromosome) -> float:
         """Return a fitness score for the guess"""
 
+    def delta(
+        self, parent_fitness: float, parent: Chromosome, child: Chromosome
+    ) -> float:
+        """Return the fitness of a child created by mutating the parent. Fitness
+        functions that can score only the genes changed by the mutation should
+        override this, by default the child is evaluated in full.
+
+        Parameters
+        ----------
+        parent_fitness : float
+            The fitness of the parent
+        parent : Chromosome
+            The parent the child was mutated from
+        child : Chromosome
+            The child to evaluate
+
+        Returns
+        -------
+        float
+            The fitness of the child
+        """
+        return self(child)
+
+
+def genes_key(genes: Any) -> Optional[Hashable]:
+    """Return a hashable key which is the same for equal genes, or None if the genes
+    are not of a type which can be keyed by their contents.
+
+    Parameters
+    ----------
+    genes : Any
+        The genes of a chromosome
+
+    Returns
+    -------
+    Optional[Hashable]
+        The key of the genes, or None if the genes can't be keyed
+    """
+
+    if isinstance(genes, np.ndarray):
+        if genes.dtype.hasobject:
+            return None
+        # a digest of the bytes rather than the bytes themselves, as large genes
+        # would make every cache entry as big as the genes
+        digest = blake2b(np.ascontiguousarray(genes), digest_size=16).digest()
+        return genes.shape, genes.dtype.str, digest
+
+    if isinstance(genes, str):
+        return genes
+
+    # a bytearray can be changed in place, so its key is an immutable copy
+    if isinstance(genes, (bytes, bytearray)):
+        return bytes(genes)
+
+    if isinstance(genes, (list, tuple)):
+        key = tuple(genes)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    return None
+
+
+class CachedFitness(AbsoluteFitness):
+    """An absolute fitness which remembers the fitnesses of recently evaluated
+    chromosomes, so a chromosome with the same genes as one seen recently is not
+    evaluated again. Subclasses implement evaluate, and evaluate_delta if they can
+    score a child from the genes changed by a mutation.
+    """
+
+    def __init__(self, cache_size: int = FITNESS_CACHE_SIZE) -> None:
+
+        # fitnesses of recently seen chromosomes, least recently used first
+        self.cache_size = cache_size
+        self.cache: OrderedDict[Hashable, float] = OrderedDict()
+
+    @staticmethod
+    def cache_key(chromosome: Chromosome) -> Optional[Hashable]:
+        """Return the key of a chromosome in the fitness cache, which is the same for
+        chromosomes with the same genes."""
+        return genes_key(chromosome.genes)
+
+    def cache_fitness(self, key: Hashable, fitness: float):
+        """Add a fitness to the cache, evicting the least recently used fitness if
+        the cache is full."""
+
+        self.cache[key] = fitness
+
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def cache_clear(self) -> None:
+        """Clear the fitness cache. This must be called if the fitness function is
+        changed."""
+        self.cache.clear()
+
+    def __call__(self, chromosome: Chromosome) -> float:
+        """Return the fitness of a chromosome, from the cache if a chromosome with the
+        same genes has been evaluated recently.
+
+        Parameters
+        ----------
+        chromosome : Chromosome
+            The chromosome to evaluate
+
+        Returns
+        -------
+        float
+            The fitness of the chromosome
+        """
+
+        key = self.cache_key(chromosome)
+
+        if key is None:
+            return self.evaluate(chromosome)
+
+        fitness = self.cache.get(key)
+
+        if fitness is None:
+            fitness = self.evaluate(chromosome)
+            self.cache_fitness(key, fitness)
+        else:
+            self.cache.move_to_end(key)
+
+        return fitness
+
+    def delta(
+        self, parent_fitness: float, parent: Chromosome, child: Chromosome
+    ) -> float:
+        """Return the fitness of a child created by mutating the parent, from the
+        cache if a chromosome with the same genes has been evaluated recently.
+
+        Parameters
+        ----------
+        parent_fitness : float
+            The fitness of the parent
+        parent : Chromosome
+            The parent the child was mutated from
+        child : Chromosome
+            The child to evaluate
+
+        Returns
+        -------
+        float
+            The fitness of the child
+        """
+
+        key = self.cache_key(child)
+
+        if key is None:
+            return self.evaluate_delta(parent_fitness, parent, child)
+
+        fitness = self.cache.get(key)
+
+        if fitness is None:
+            fitness = self.evaluate_delta(parent_fitness, parent, child)
+            self.cache_fitness(key, fitness)
+        else:
+            self.cache.move_to_end(key)
+
+        return fitness
+
+    @abstractmethod
+    def evaluate(self, chromosome: Chromosome) -> float:
+        """Return the fitness of a chromosome, without using the cache"""
+
+    def evaluate_delta(
+        self, parent_fitness: float, parent: Chromosome, child: Chromosome
+    ) -> float:
+        """Return the fitness of a child created by mutating the parent, without
+        using the cache. By default the child is evaluated in full."""
+        return self.evaluate(child)
+
+
+class FitnessCache(CachedFitness):
+    """Wrap an absolute fitness function so that its fitnesses are cached. The
+    fitness must only depend on the genes of the chromosome."""
+
+    def __init__(
+        self, fitness: AbsoluteFitness, cache_size: int = FITNESS_CACHE_SIZE
+    ) -> None:
+        super().__init__(cache_size)
+        self.fitness = fitness
+
+    def evaluate(self, chromosome: Chromosome) -> float:
+        return self.fitness(chromosome)
+
+    def evaluate_delta(
+        self, parent_fitness: float, parent: Chromosome, child: Chromosome
+    ) -> float:
+        return self.fitness.delta(parent_fitness, parent, child)
+
+
+class BatchFitness(AbsoluteFitness):
+    """An absolute fitness which can evaluate a batch of chromosomes at once, e.g.
+    with a single numpy operation over all of them rather than a Python call for
+    each. The runner uses evaluate_batch for the children of each iteration when
+    batch_size is above 1.
+    """
+
+    def __call__(self, chromosome: Chromosome) -> float:
+        """Return the fitness of a single chromosome. Subclasses should override this
+        if a single chromosome can be evaluated more cheaply than a batch of one."""
+        return self.evaluate_batch([chromosome])[0]
+
+    @abstractmethod
+    def evaluate_batch(self, chromosomes: List[Chromosome]) -> np.ndarray:
+        """Return the fitnesses of a batch of chromosomes.
+
+        Parameters
+        ----------
+        chromosomes : List[Chromosome]
+            The chromosomes to evaluate
+
+        Returns
+        -------
+        np.ndarray
+            The fitness of each chromosome
+        """
+
 
 class RelativeFitness(Fitness):
-    """A fitness function that can be computed from the chromosome's genes."""
+    """A fitness function that can be computed from the chromosome's genes. One is
+    created for every chromosome evaluated, so the chromosome is stored in a slot
+    rather than a __dict__. Subclasses should declare empty __slots__ to keep this.
+    """
+
+    __slots__ = ("chromosome",)
 
     def __init__(self, chromosome: Chromosome):
         self.chromosome = chromosome
@@ -87,6 +338,15 @@ class RelativeFitness(Fitness):
     def __gt__(self, other: RelativeFitness) -> bool:
         """Return True if this fitness is better than the other."""
 
+    @classmethod
+    def delta(
+        cls, parent_fitness: RelativeFitness, parent: Chromosome, child: Chromosome
+    ):
+        """Return the fitness of a child created by mutating the parent. Relative
+        fitnesses are cheap to construct, so the child is always evaluated in full.
+        """
+        return cls(child)
+
 
 class Mutation(ABC):
     """Abstract base class for mutation functions."""
@@ -104,16 +364,13 @@ class Crossover:
     pass
 
 
-class Population:
-    pass
-
-
 class StoppingCriteria(ABC):
     """Abstract base class for stopping criteria functions."""
 
     @abstractmethod
-    def __call__(self, chromosome: Chromosome) -> bool:
-        """Return true if can stop the genetic algorithm."""
+    def __call__(self, chromosome: Chromosome, chromosome_fitness=None) -> bool:
+        """Return true if can stop the genetic algorithm. The runner passes in the
+        fitness of the chromosome, so it doesn't need to be evaluated again."""
 
 
 class ChromosomeGenerator(ABC):
@@ -135,6 +392,128 @@ class AgeAnnealing:
         self.age_limit = age_limit
         self.historical_fitnesses: List[float] = []
 
+    def add_historical_fitness(self, fitness: float) -> None:
+        """Add a fitness to the historical fitnesses, keeping them sorted. The runner
+        adds best parent fitnesses, which only increase, so this is an append."""
+        insort(self.historical_fitnesses, fitness)
+
+    def proportion_similar(self, fitness: float) -> float:
+        """Return the proportion of historical fitnesses which are worse than the
+        fitness. The historical fitnesses are sorted, so this is a binary search.
+
+        Parameters
+        ----------
+        fitness : float
+            The fitness to compare to the historical fitnesses
+
+        Returns
+        -------
+        float
+            The proportion of historical fitnesses worse than the fitness
+        """
+        historical_fitnesses = self.historical_fitnesses
+        return bisect_left(historical_fitnesses, fitness) / len(historical_fitnesses)
+
+    def choose_annealing(self, fitness: float) -> bool:
+        """Return True if the search should restart from the best parent rather than
+        continue from a child with the fitness. The better the child compared to the
+        historical fitnesses, the more likely the search continues from the child.
+
+        Parameters
+        ----------
+        fitness : float
+            The fitness of the child
+
+        Returns
+        -------
+        bool
+            True if annealing is chosen
+        """
+        return random.random() >= exp(-self.proportion_similar(fitness))
+
+
+class Population:
+    """A small population of chromosomes and their fitnesses, from which the runner
+    picks each parent rather than always mutating the last accepted child. Parents
+    are picked by roulette selection with probability proportional to
+    exp(selection_pressure * fitness), so fitter chromosomes are picked more often
+    but less fit ones are still explored. The fitnesses must be numbers.
+    """
+
+    def __init__(self, size: int = 8, selection_pressure: float = 1.0):
+        self.size = size
+        self.selection_pressure = selection_pressure
+        self.members: List[Tuple[Chromosome, float]] = []
+        self.cumulative_weights: List[float] = []
+
+    def add(self, chromosome: Chromosome, fitness: float) -> bool:
+        """Add a chromosome to the population. Once the population is full, the
+        chromosome replaces the least fit member if it is more fit, so the fittest
+        chromosomes found are always kept.
+
+        Parameters
+        ----------
+        chromosome : Chromosome
+            The chromosome to add
+        fitness : float
+            The fitness of the chromosome
+
+        Returns
+        -------
+        bool
+            True if the chromosome was added to the population
+        """
+        members = self.members
+
+        if len(members) < self.size:
+            members.append((chromosome, fitness))
+        else:
+            worst_index = min(range(len(members)), key=lambda ii: members[ii][1])
+            if members[worst_index][1] >= fitness:
+                return False
+            members[worst_index] = (chromosome, fitness)
+
+        # the weights are recalculated when the next parent is selected
+        self.cumulative_weights = []
+        return True
+
+    def select(self) -> Tuple[Chromosome, float]:
+        """Select a member of the population by roulette selection. The cumulative
+        weights are only recalculated when the members change, and each selection
+        is a binary search of them.
+
+        Returns
+        -------
+        Tuple[Chromosome, float]
+            The selected chromosome and its fitness
+        """
+        if not self.cumulative_weights:
+            best_fitness = max(fitness for _, fitness in self.members)
+            # relative to the best fitness, so that exp does not overflow
+            self.cumulative_weights = list(
+                accumulate(
+                    exp(self.selection_pressure * (fitness - best_fitness))
+                    for _, fitness in self.members
+                )
+            )
+
+        cumulative_weights = self.cumulative_weights
+        index = bisect_right(
+            cumulative_weights, random.random() * cumulative_weights[-1]
+        )
+        return self.members[index]
+
+
+class IterationResult(Enum):
+    """The result of an iteration of the genetic algorithm, which tells the runner
+    whether to carry on. Returned rather than raised, as most iterations end early.
+    """
+
+    CONTINUE = "continue"
+    IMPROVED = "improved"
+    STOP = "stop"
+    STAGNATED = "stagnated"
+
 
 class Runner(ABC):
     """Class for running the genetic algorithm."""
@@ -142,8 +521,17 @@ class Runner(ABC):
     start_time: float
     iteration_num: int
     best_parent: Chromosome
+    best_parent_fitness: float
     parent: Chromosome
+    parent_fitness: float
     child: Chromosome
+    fitness_fn: Callable[[Chromosome], float]
+    fitness_delta_fn: Callable[[float, Chromosome, Chromosome], float]
+    fitness_map_delta_fn: Callable[[float, Chromosome, Chromosome], float]
+    fitness_batch_fn: Optional[Callable[[List[Chromosome]], np.ndarray]]
+    mutate_fn: Callable[[Chromosome], Chromosome]
+    stopping_criteria_fn: Callable[[Chromosome], bool]
+    fitness_is_relative: bool
 
     def __init__(
         self,
@@ -153,9 +541,19 @@ class Runner(ABC):
         mutate: Mutation,
         age_annealing: AgeAnnealing,
         fitness_stagnation_detector: FitnessStagnationDetector,
+        cache_fitness: bool = False,
+        batch_size: int = 1,
+        map_fn: Callable = map,
+        population: Optional[Population] = None,
+        max_iterations: float = float("inf"),
     ) -> None:
 
         self.iteration_num = 0
+        self.cache_fitness = cache_fitness
+        self.batch_size = batch_size
+        self.map_fn = map_fn
+        self.population = population
+        self.max_iterations = max_iterations
         self.chromosome_generator = chromosome_generator
         self.fitness = fitness
         self.stopping_criteria = stopping_criteria
@@ -164,205 +562,343 @@ class Runner(ABC):
         self.fitness_stagnation_detector = fitness_stagnation_detector
 
     @abstractmethod
-    def display(self, candidate):
-        """Display the candidate in a runner specific way"""
+    def display(self, candidate, fitness):
+        """Display the candidate in a runner specific way. The candidate's fitness is
+        passed in as it has already been calculated by the runner."""
 
-    def run(self) -> Chromosome:
+    def run(self, initial_chromosome: Optional[Chromosome] = None) -> Chromosome:
         """Run the genetic algorithm.
 
+        Parameters
+        ----------
+        initial_chromosome : Optional[Chromosome], optional
+            The chromosome to start from, e.g. a migrant from another island, by
+            default a chromosome from the chromosome generator
+
         Returns
         -------
         Chromosome
             The best chromosome found
         """
-        logging.info("Starting genetic algorithm run")
+        logger.info("Starting genetic algorithm run")
         self.start_time = time.time()
+        self.bind_callables()
+
+        if initial_chromosome is None:
+            self.best_parent = self.chromosome_generator()
+        else:
+            self.best_parent = initial_chromosome.clone()
+        self.best_parent_fitness = self.fitness_fn(self.best_parent)
+        logger.info("Initial chromosome: %s", self.best_parent)
 
-        self.best_parent = self.chromosome_generator()
-        logging.info("Initial chromosome: %s", self.best_parent)
+        if self.stopping_criteria_fn(self.best_parent, self.best_parent_fitness):
+            logger.info(
+                "Stopping criteria met by initial chromosome %s", self.best_parent
+            )
+            return self.best_parent
+
+        logger.debug("Adding initial chromosome fitness to historical fitnesses")
+        self.age_annealing.add_historical_fitness(self.best_parent_fitness)
+
+        logger.debug("Creating parent copy from initial chromosome")
+        self.set_parent(self.best_parent.clone(), self.best_parent_fitness)
+
+        if self.population is not None:
+            self.population.add(self.best_parent, self.best_parent_fitness)
+
+        # looked up once, as the loop below runs for every iteration
+        main_loop = self.main_loop
+        is_debug_enabled = logger.isEnabledFor
+        iteration_continues = IterationResult.CONTINUE
+        max_iterations = self.max_iterations
+
+        with tqdm() as progress_bar:
+            while True:  # repeat until the stopping criteria are met
+                if self.iteration_num >= max_iterations:
+                    logger.info("Iteration limit of %s reached", max_iterations)
+                    return self.best_parent
+
+                self.iteration_num += 1
+                if self.iteration_num % PROGRESS_BAR_INTERVAL == 0:
+                    progress_bar.update(PROGRESS_BAR_INTERVAL)
+                if is_debug_enabled(logging.DEBUG):
+                    logger.debug("Starting iteration %s", self.iteration_num)
+
+                result = main_loop()
+
+                if result is iteration_continues:
+                    continue
+
+                if result is IterationResult.STOP:
+                    logger.info(
+                        "Stopping criteria met by chromosome %s on iteration %d",
+                        self.child,
+                        self.iteration_num,
+                    )
+                    return self.child
+
+                if result is IterationResult.STAGNATED:
+                    logger.info("Fitness stagnation detected")
+                    logger.info("Best chromosome found: %s", self.best_parent)
+                    return self.best_parent
+
+    def bind_callables(self):
+        """Bind the fitness, mutation and stopping criteria call methods once, so
+        the main loop does not look up ``__call__`` on every iteration. If
+        cache_fitness is set, absolute fitnesses are cached so each chromosome is
+        only evaluated once. This is opt-in, as for cheap fitness functions keying
+        the cache costs more than evaluating the chromosome. Relative fitnesses keep
+        a reference to the chromosome, so are never cached.
+        """
+        fitness = self.fitness
+
+        if (
+            self.cache_fitness
+            and isinstance(fitness, AbsoluteFitness)
+            and not isinstance(fitness, CachedFitness)
+        ):
+            fitness = FitnessCache(fitness)
+
+        self.fitness_fn = fitness.__call__
+        self.fitness_delta_fn = fitness.delta
+
+        # a map function such as Pool.map pickles the function for each task, which
+        # would copy the whole cache and drop the updates made to it by the workers,
+        # so only the builtin map evaluates children through the cache
+        self.fitness_map_delta_fn = (
+            self.fitness_delta_fn if self.map_fn is map else self.fitness.delta
+        )
 
-        if self.stopping_criteria(self.best_parent):
-            raise StoppingCriteriaMet(self.best_parent, self.iteration_num)
+        self.mutate_fn = self.mutate.__call__
+        self.stopping_criteria_fn = self.stopping_criteria.__call__
+        # a relative fitness is passed in as its class, and called to create one
+        self.fitness_is_relative = isinstance(fitness, type) and issubclass(
+            fitness, RelativeFitness
+        )
 
-        logging.debug("Adding initial chromosome fitness to historical fitnesses")
-        self.age_annealing.historical_fitnesses.append(self.fitness(self.best_parent))
+        self.fitness_batch_fn = (
+            self.fitness.evaluate_batch
+            if isinstance(self.fitness, BatchFitness)
+            else None
+        )
 
-        logging.debug("Creating parent copy from initial chromosome")
-        self.parent = deepcopy(self.best_parent)
+    def main_loop(self) -> IterationResult:
+        """Main loop for the genetic algorithm.
 
-        def generator():
-            while True:  # repeat until child is as good or better than the parent
-                yield
+        Returns
+        -------
+        IterationResult
+            STOP if the child meets the stopping criteria, STAGNATED if the fitness
+            has stagnated, otherwise CONTINUE
+        """
+        population = self.population
+        if population is not None:
+            self.parent, self.parent_fitness = population.select()
 
-        for _ in tqdm(generator()):
-            self.iteration_num += 1
-            logging.debug("Starting iteration %s", self.iteration_num)
+        # the parent fitness is kept from when the parent was chosen
+        parent_fitness = self.parent_fitness
 
-            try:
-                self.main_loop()
-            except FitnessStagnationDetected as exception:
-                return exception.chromosome
-            except StoppingCriteriaMet as exception:
-                return exception.chromosome
-            except ContinueLoop:
-                continue
+        if self.batch_size > 1:
+            child_fitness = self.create_children(parent_fitness)
+        else:
+            self.create_child()
+            child_fitness = self.fitness_delta_fn(
+                parent_fitness, self.parent, self.child
+            )
 
-    def main_loop(self):
-        """Main loop for the genetic algorithm."""
-        self.create_child()
+        if population is not None:
+            population.add(self.child, child_fitness)
 
-        (
-            parent_fitness,
-            child_fitness,
-        ) = self.calculate_parent_child_fitnesses()
-        self.compare_parent_and_child(parent_fitness, child_fitness)
+        result = self.compare_parent_and_child(parent_fitness, child_fitness)
 
-        best_parent_fitness = self.fitness(self.best_parent)
-        self.compare_best_parent_and_child(best_parent_fitness, child_fitness)
-        self.check_stopping_criteria()
+        if result is IterationResult.IMPROVED:
+            self.compare_best_parent_and_child(self.best_parent_fitness, child_fitness)
+            result = (
+                IterationResult.STOP
+                if self.check_stopping_criteria(child_fitness)
+                else IterationResult.CONTINUE
+            )
 
-        self.best_parent = self.child
-        logging.debug("Iteration complete")
-        logging.debug("= " * 30)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Iteration complete")
+            logger.debug(SEPARATOR)
 
-    def calculate_parent_child_fitnesses(self) -> Tuple[float, float, float]:
-        return map(self.fitness, (self.parent, self.child))
+        return result
 
     def compare_best_parent_and_child(self, best_parent_fitness, child_fitness):
         """Compare the best parent and child fitnesses."""
 
-        logging.debug("Comparing child to best parent...")
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        if debug:
+            logger.debug("Comparing child to best parent...")
         if best_parent_fitness < child_fitness:
-            logging.debug("Child is more fit than best parent")
+            if debug:
+                logger.debug("Child is more fit than best parent")
             self.best_parent = self.child
-            self.age_annealing.historical_fitnesses.append(best_parent_fitness)
+            self.best_parent_fitness = child_fitness
+            self.age_annealing.add_historical_fitness(best_parent_fitness)
 
-            logging.info(
+            logger.info(
                 "Iteration %s - New best chromosome found: %s",
                 self.iteration_num,
                 self.best_parent,
             )
 
-            self.display(self.child)
-        else:
-            logging.debug("Best parent is as fit or more fit than child")
+            self.display(self.child, child_fitness)
+        elif debug:
+            logger.debug("Best parent is as fit or more fit than child")
+
+    def compare_parent_and_child(
+        self, parent_fitness, child_fitness
+    ) -> IterationResult:
+        """Compare the parent and child fitnesses, and choose the next parent.
 
-    def compare_parent_and_child(self, parent_fitness, child_fitness):
-        """Compare the parent and child fitnesses."""
+        Returns
+        -------
+        IterationResult
+            IMPROVED if the child is more fit than the parent, STAGNATED if the
+            fitness has stagnated, otherwise CONTINUE
+        """
+
+        debug = logger.isEnabledFor(logging.DEBUG)
 
-        logging.debug("Comparing child and parent fitness...")
         if parent_fitness > child_fitness:
-            logging.debug("Child is not as fit as parent")
-            self.detect_fitness_stagnation()
+            if debug:
+                logger.debug("Child is not as fit as parent")
+            if self.detect_fitness_stagnation():
+                return IterationResult.STAGNATED
             self.run_age_annealing(child_fitness)
+            return IterationResult.CONTINUE
 
         if parent_fitness == child_fitness:
+            if debug:
+                logger.debug("Child is as fit as parent")
             self.child.age = self.parent.age + 1
-            self.parent = deepcopy(self.child)
-            raise ContinueLoop("Child is as fit as parent")
+            self.set_parent(self.child.clone(), child_fitness)
+            return IterationResult.CONTINUE
 
-        logging.debug("Child is more fit than parent")
+        if debug:
+            logger.debug("Child is more fit than parent")
         self.child.age = 0
-        self.parent = deepcopy(self.child)
+        self.set_parent(self.child.clone(), child_fitness)
+        return IterationResult.IMPROVED
+
+    def set_parent(self, parent: Chromosome, parent_fitness) -> None:
+        """Set the parent and its fitness. A relative fitness refers to the
+        chromosome it was created from, so when the parent is a copy its fitness is
+        created again from the copy. Otherwise it would not see the parent age.
+
+        Parameters
+        ----------
+        parent : Chromosome
+            The new parent
+        parent_fitness : Any
+            The fitness of the chromosome the parent was copied from
+        """
+        self.parent = parent
+        self.parent_fitness = (
+            self.fitness_fn(parent) if self.fitness_is_relative else parent_fitness
+        )
 
-    def check_stopping_criteria(self):
-        """Check if the stopping criteria has been met."""
+    def check_stopping_criteria(self, child_fitness) -> bool:
+        """Return True if the child meets the stopping criteria."""
 
-        logging.debug("Checking stopping criteria...")
-        if self.stopping_criteria(self.child):
-            raise StoppingCriteriaMet(self.child, self.iteration_num)
-        logging.debug("Stopping criteria not met by child")
+        if self.stopping_criteria_fn(self.child, child_fitness):
+            return True
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Stopping criteria not met by child")
+        return False
 
     def create_child(self):
         """Create a child by mutating the parent."""
 
-        logging.debug("Creating child by mutating parent...")
-        self.child = self.mutate(self.parent)
-        logging.debug("Child created: %s", str(self.child))
+        self.child = self.mutate_fn(self.parent)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Child created: %s", self.child)
 
-    def detect_fitness_stagnation(self):
-        """Detect fitness stagnation."""
-
-        logging.debug("Checking fitness stagnation...")
-        if self.fitness_stagnation_detector(self.best_parent):
-            raise FitnessStagnationDetected(self.best_parent, self.iteration_num)
-        logging.debug("Fitness stagnation not detected")
-
-    def run_age_annealing(self, child_fitness):
-        """Run age annealing."""
+    def create_children(self, parent_fitness) -> Any:
+        """Create a batch of batch_size children by mutating the parent, and keep the
+        fittest as the child. A BatchFitness evaluates all the children in one call.
+        Otherwise the children are evaluated with map_fn, so passing e.g.
+        multiprocessing.Pool.map evaluates them in parallel. This only pays off when
+        the fitness is expensive to calculate, as the children and fitness have to be
+        pickled to send them to the other processes. The fitness cache is not sent
+        with them, so with any map_fn but the builtin map the children are not cached.
 
-        logging.debug("Checking age annealing...")
-        if not self.age_annealing.age_limit:
-            raise ContinueLoop("No age limit set, skipping age annealing")
+        Parameters
+        ----------
+        parent_fitness : Any
+            The fitness of the parent
 
-        logging.debug("Incrementing parent age")
-        self.parent.age += 1
-        logging.debug("Parent age: %s", self.parent.age)
+        Returns
+        -------
+        Any
+            The fitness of the fittest child
+        """
 
-        logging.debug(
-            "Comparing parent age to age annealing limit (%s)...",
-            self.age_annealing.age_limit,
-        )
-        if self.parent.age < self.age_annealing.age_limit:
-            raise ContinueLoop("Parent age below limit, skipping age annealing")
-
-        logging.debug("Parent age above limit, considering age annealing...")
-        index = bisect_left(
-            self.age_annealing.historical_fitnesses,
-            child_fitness,
-            0,
-            len(self.age_annealing.historical_fitnesses),
-        )
+        parent = self.parent
+        children = [self.mutate_fn(parent) for _ in range(self.batch_size)]
 
-        proportion_similar = index / len(self.age_annealing.historical_fitnesses)
-        logging.debug(
-            "Proportion of historical fitnesses similar to child: %s",
-            proportion_similar,
-        )
+        if self.fitness_batch_fn is not None:
+            child_fitnesses = self.fitness_batch_fn(children).tolist()
+        else:
+            child_fitnesses = list(
+                self.map_fn(
+                    partial(self.fitness_map_delta_fn, parent_fitness, parent),
+                    children,
+                )
+            )
 
-        if random.random() < exp(-proportion_similar):
-            self.parent = self.child
-            raise ContinueLoop("Annealing not chosen, skipping age annealing")
+        best_index = 0
+        for index in range(1, len(children)):
+            if child_fitnesses[index] > child_fitnesses[best_index]:
+                best_index = index
 
-        logging.debug("Annealing chosen, resetting parent to best parent")
-        self.best_parent.age = 0
-        self.parent = self.best_parent
+        self.child = children[best_index]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Fittest of %d children: %s", len(children), self.child)
 
+        return child_fitnesses[best_index]
 
-class StoppingCriteriaMet(Exception):
-    """Exception raised when stopping criteria is met."""
+    def detect_fitness_stagnation(self) -> bool:
+        """Return True if the fitness of the best parent has stagnated."""
 
-    def __init__(self, chromosome: Chromosome, iteration_num: int):
-        self.chromosome = chromosome
-        self.iteration_num = iteration_num
-        logging.info(
-            "Stopping criteria met by chromosome %s on iteration %d",
-            chromosome,
-            iteration_num,
-        )
-        logging.debug("Iteration complete")
-        logging.debug("= " * 30)
+        if self.fitness_stagnation_detector(self.best_parent, self.best_parent_fitness):
+            return True
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Fitness stagnation not detected")
+        return False
 
+    def run_age_annealing(self, child_fitness):
+        """Age the parent, and once it reaches the age limit choose whether to carry
+        on from the child or go back to the best parent."""
 
-class FitnessStagnationDetected(Exception):
-    """Exception raised when fitness stagnation is detected."""
+        debug = logger.isEnabledFor(logging.DEBUG)
 
-    def __init__(self, chromosome: Chromosome, iteration_num: int):
-        self.chromosome = chromosome
-        self.iteration_num = iteration_num
-        logging.info("Fitness stagnation detected")
-        logging.info("Best chromosome found: %s", chromosome)
-        logging.debug("Iteration complete")
-        logging.debug("= " * 30)
+        if not self.age_annealing.age_limit:
+            if debug:
+                logger.debug("No age limit set, skipping age annealing")
+            return
 
+        self.parent.age += 1
+        if self.parent.age < self.age_annealing.age_limit:
+            if debug:
+                logger.debug("Parent age below limit, skipping age annealing")
+            return
 
-class ContinueLoop(Exception):
-    """Exception raised to continue the loop."""
+        if not self.age_annealing.choose_annealing(child_fitness):
+            if debug:
+                logger.debug("Annealing not chosen, continuing from child")
+            self.parent = self.child
+            self.parent_fitness = child_fitness
+            return
 
-    def __init__(self, message):
-        logging.debug(message)
-        logging.debug("Iteration complete")
-        logging.debug("= " * 30)
+        if debug:
+            logger.debug("Annealing chosen, resetting parent to best parent")
+        self.best_parent.age = 0
+        self.parent = self.best_parent
+        self.parent_fitness = self.best_parent_fitness
 
 
 class FitnessStagnationDetector(StoppingCriteria):
@@ -378,29 +914,187 @@ class FitnessStagnationDetector(StoppingCriteria):
         self.last_fitness = None
         self.last_generation = 0
 
-    def __call__(self, chromosome) -> bool:
-        """Return true if can stop the genetic algorithm."""
+    def __call__(self, chromosome, chromosome_fitness=None) -> bool:
+        """Return true if can stop the genetic algorithm. The fitness of the
+        chromosome is calculated unless it is passed in."""
 
-        chromosome_fitness = self.fitness(chromosome)
+        if chromosome_fitness is None:
+            chromosome_fitness = self.fitness(chromosome)
 
         if self.last_fitness is None:
             self.last_fitness = chromosome_fitness
             self.last_generation = 0
-            logging.debug("FitnessStagnationDetection: setting first fitness")
+            logger.debug("FitnessStagnationDetector: setting first fitness")
             return False
 
         if chromosome_fitness > self.last_fitness:
             self.last_fitness = chromosome_fitness
             self.last_generation = 0
-            logging.debug("FitnessStagnationDetection: fitness improved")
+            logger.debug("FitnessStagnationDetector: fitness improved")
             return False
 
         self.last_generation += 1
 
         if self.last_generation >= self.generations_limit:
-            logging.info(
-                "FitnessStagnationDetection: %s generations without improvement",
+            logger.info(
+                "FitnessStagnationDetector: %s generations without improvement",
                 self.last_generation,
             )
 
         return self.last_generation >= self.generations_limit
+
+
+def run_island(
+    create_runner: Callable[[], Runner], seed: int
+) -> Tuple[Chromosome, Any]:
+    """Run the genetic algorithm on a single island, seeding the random number
+    generator so that each island evolves differently.
+
+    Parameters
+    ----------
+    create_runner : Callable[[], Runner]
+        Function which creates the runner for the island
+    seed : int
+        Seed for the random number generator of the island
+
+    Returns
+    -------
+    Tuple[Chromosome, Any]
+        The best chromosome found on the island and its fitness
+    """
+
+    random.seed(seed)
+    runner = create_runner()
+
+    best = runner.run()
+
+    return best, runner.fitness_fn(best)
+
+
+def run_islands(
+    create_runner: Callable[[], Runner],
+    num_islands: int,
+    seed: Optional[int] = None,
+) -> Chromosome:
+    """Run the genetic algorithm on several islands in parallel processes, and
+    return the best chromosome found on any island. The islands evolve
+    independently, so this uses all the cores of the machine for problems where a
+    single run gets stuck in a local maximum.
+
+    Parameters
+    ----------
+    create_runner : Callable[[], Runner]
+        Function which creates the runner for an island. This is called in each
+        worker process, so must be picklable, e.g. a module level function
+    num_islands : int
+        The number of islands, each of which is run in its own process
+    seed : Optional[int], optional
+        Seed used to generate the seed of each island, by default None
+
+    Returns
+    -------
+    Chromosome
+        The best chromosome found on any island
+    """
+
+    rng = random.Random(seed)
+    seeds = [rng.getrandbits(32) for _ in range(num_islands)]
+
+    with multiprocessing.Pool(num_islands) as pool:
+        results = pool.starmap(run_island, [(create_runner, seed) for seed in seeds])
+
+    best, _ = max(results, key=lambda result: result[1])
+    return best
+
+
+def run_island_epoch(
+    create_runner: Callable[[], Runner],
+    seed: int,
+    initial_chromosome: Optional[Chromosome],
+    num_iterations: int,
+) -> Tuple[Chromosome, Any, bool]:
+    """Run the genetic algorithm on a single island for a limited number of
+    iterations, starting from a given chromosome.
+
+    Parameters
+    ----------
+    create_runner : Callable[[], Runner]
+        Function which creates the runner for the island
+    seed : int
+        Seed for the random number generator of the island
+    initial_chromosome : Optional[Chromosome]
+        The chromosome to start from, or None to generate one
+    num_iterations : int
+        The maximum number of iterations to run for
+
+    Returns
+    -------
+    Tuple[Chromosome, Any, bool]
+        The best chromosome found on the island, its fitness, and whether it meets
+        the stopping criteria
+    """
+
+    random.seed(seed)
+    runner = create_runner()
+    runner.max_iterations = num_iterations
+
+    best = runner.run(initial_chromosome)
+
+    fitness = runner.fitness_fn(best)
+    return best, fitness, runner.stopping_criteria_fn(best, fitness)
+
+
+def run_islands_with_migration(
+    create_runner: Callable[[], Runner],
+    num_islands: int,
+    migration_interval: int,
+    num_migrations: int,
+    seed: Optional[int] = None,
+) -> Chromosome:
+    """Run the genetic algorithm on several islands in parallel processes, with
+    the best chromosome found on any island migrating to every island after each
+    migration_interval iterations. Each island then carries on from the migrant
+    with its own random numbers. The chromosomes are only sent between processes
+    when migrating, so the overhead is small if the interval is long.
+
+    Parameters
+    ----------
+    create_runner : Callable[[], Runner]
+        Function which creates the runner for an island. This is called in each
+        worker process, so must be picklable, e.g. a module level function
+    num_islands : int
+        The number of islands, each of which is run in its own process
+    migration_interval : int
+        The number of iterations each island runs for between migrations
+    num_migrations : int
+        The maximum number of migrations, after which the best chromosome found
+        is returned
+    seed : Optional[int], optional
+        Seed used to generate the seed of each island, by default None
+
+    Returns
+    -------
+    Chromosome
+        The best chromosome found on any island, which is returned as soon as an
+        island finds a chromosome which meets the stopping criteria
+    """
+
+    rng = random.Random(seed)
+    best = None
+
+    with multiprocessing.Pool(num_islands) as pool:
+        for migration_num in range(num_migrations + 1):
+            seeds = [rng.getrandbits(32) for _ in range(num_islands)]
+            results = pool.starmap(
+                run_island_epoch,
+                [(create_runner, seed, best, migration_interval) for seed in seeds],
+            )
+
+            best, _, stopping_criteria_met = max(results, key=lambda result: result[1])
+
+            if stopping_criteria_met:
+                break
+
+            logger.info("Migration %d: best chromosome %s", migration_num + 1, best)
+
+    return best
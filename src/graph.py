@@ -1,15 +1,135 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from heapq import heapify, heappop, heappush
+from itertools import chain
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Dict, List, Optional, Tuple
 
 import networkx as nx
+import numpy as np
 from matplotlib import pyplot as plt
 
+# the number of parsed .col files kept by read_col_file
+COL_FILE_CACHE_SIZE = 16
+
+
+def parse_col_file_text(text: str) -> Tuple[List[str], List[str], int, int]:
+    """Parse the text of a .col file.
+
+    Parameters
+    ----------
+    text : str
+        The text of the file.
+
+    Returns
+    -------
+    Tuple[List[str], List[str], int, int]
+        The nodes in the order they first appear, the two nodes of each edge in
+        turn in file order, and the number of nodes and edges given in the problem
+        line.
+
+    Raises
+    ------
+    ValueError
+        If a line is not a comment, problem, edge or node line, or an edge line
+        does not have two nodes.
+    """
+
+    lines = text.splitlines()
+
+    # almost every line is an edge line, so these are split first and the other
+    # lines are checked one at a time afterwards
+    edge_lines = [line for line in lines if line[:1] == "e"]
+    other_lines = [line for line in lines if line[:1] != "e"]
+    edge_fields = [line.split() for line in edge_lines]
+
+    # each line is checked, as a line with too many nodes and a line with too few
+    # would otherwise give the right number of nodes between them
+    if set(map(len, edge_fields)) - {3}:
+        line = next(
+            line for line, fields in zip(edge_lines, edge_fields) if len(fields) != 3
+        )
+        raise ValueError(f"Edge line must have two nodes: {line}")
+
+    # drop the line types, leaving the two nodes of each edge in turn. These are
+    # not paired up into tuples here, as building the adjacency does not need them
+    ends = list(chain.from_iterable(edge_fields))
+    del ends[::3]
+
+    has_node_lines = False
+
+    for line in other_lines:
+        line_type = line[:1]
+
+        if line_type == "c":
+            continue
+
+        elif line_type == "p":
+            _, _, checksum_num_nodes, checksum_num_edges = line.split()
+            checksum_num_nodes = int(checksum_num_nodes)
+            checksum_num_edges = int(checksum_num_edges)
+
+        elif line_type == "n":
+            has_node_lines = True
+        else:
+            raise ValueError(f"Unknown line type: {line}")
+
+    if has_node_lines:
+        # nodes without edges are listed in the order they appear among the edges
+        nodes = chain.from_iterable(
+            line.split()[1 : 3 if line[:1] == "e" else 2]
+            for line in lines
+            if line[:1] == "e" or line[:1] == "n"
+        )
+    else:
+        nodes = ends
+
+    # each node is usually in many edges, so duplicates are removed here once
+    return list(dict.fromkeys(nodes)), ends, checksum_num_nodes, checksum_num_edges
+
+
+def read_col_file(file_name: Path) -> Tuple[List[str], List[str], int, int]:
+    """Read and parse a .col file. The parsed file is cached, keyed by its path,
+    modification time and size, so reading an unchanged file again skips reading
+    and parsing it. The returned lists are shared between reads of the same file,
+    so must not be changed.
+
+    Parameters
+    ----------
+    file_name : Path
+        The name of the file to read.
+
+    Returns
+    -------
+    Tuple[List[str], List[str], int, int]
+        The parsed file, as returned by parse_col_file_text.
+    """
+
+    assert file_name.suffix == ".col"
+
+    path = file_name.resolve()
+    stat = path.stat()
+
+    return _read_col_file(path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=COL_FILE_CACHE_SIZE)
+def _read_col_file(
+    path: Path, mtime_ns: int, size: int
+) -> Tuple[List[str], List[str], int, int]:
+    """Read and parse a .col file. The modification time and size are not used
+    here, they are arguments so that a changed file misses the cache."""
+    return parse_col_file_text(path.read_text())
+
 
 class Graph(nx.Graph):
     """A graph, represented as a set of nodes and a set of edges."""
 
+    # attributes given to each node read from a .col file
+    node_defaults: Dict[str, Any] = {}
+
     def set_node_attribute(self, node: Any, attribute: str, value: Any) -> None:
         """Set an attribute of a node.
 
@@ -30,7 +150,28 @@ class Graph(nx.Graph):
         if node not in self.nodes:
             raise ValueError(f"Node {node} not in graph")
 
-        nx.set_node_attributes(self, value, attribute)
+        self.nodes[node][attribute] = value
+
+    def set_node_attributes_bulk(self, values: Dict[Any, Any], attribute: str) -> None:
+        """Set an attribute of several nodes at once.
+
+        Parameters
+        ----------
+        values : Dict[Any, Any]
+            A dictionary mapping nodes to the value to set the attribute to.
+        attribute : str
+            The attribute to set.
+
+        Raises
+        ------
+        ValueError
+            If any of the nodes are not in the graph.
+        """
+        missing_nodes = [node for node in values if node not in self.nodes]
+        if missing_nodes:
+            raise ValueError(f"Nodes {missing_nodes} not in graph")
+
+        nx.set_node_attributes(self, values, attribute)
 
     def from_col_file(self, file_name: Path) -> Graph:
         """Read a graph from a .col file. This is an alternative constructor.
@@ -46,77 +187,94 @@ class Graph(nx.Graph):
             The graph read from the file.
         """
 
-        assert file_name.suffix == ".col"
-
-        with open(file_name, "r") as col_file:
-            lines = col_file.readlines()
-
         (
             graph,
             checksum_num_nodes,
             checksum_num_edges,
-        ) = self._populate_graph_from_col_file(lines)
+        ) = self._populate_graph_from_col_file(read_col_file(file_name))
 
-        self._validate_col_file_checksum(graph, checksum_num_nodes, checksum_num_edges)
+        self._validate_col_file_checksum(
+            len(graph.nodes), len(graph.edges), checksum_num_nodes, checksum_num_edges
+        )
 
         return graph
 
-    def _populate_graph_from_col_file(self, lines):
+    def _populate_graph_from_col_file(self, col_file):
+        """Populate an empty graph from a parsed .col file. The nodes and edges are
+        added with a single call each, which is much faster than adding them one at
+        a time for large graphs."""
 
         graph = self.empty_graph()
 
-        for line in lines:
-            if line.startswith("c"):
-                continue
-
-            elif line.startswith("p"):
-                _, _, checksum_num_nodes, checksum_num_edges = line.strip().split()
-                checksum_num_nodes = int(checksum_num_nodes)
-                checksum_num_edges = int(checksum_num_edges)
+        nodes, edge_ends, checksum_num_nodes, checksum_num_edges = col_file
 
-            elif line.startswith("e"):
-                node1, node2 = line.split()[1:]
-                graph.add_nodes_from((node1, node2))
-                graph.add_edge(node1, node2)
-
-            elif line.startswith("n"):
-                node = line.split()[1]
-                graph.add_node(node)
-            else:
-                raise ValueError(f"Unknown line type: {line}")
+        graph.add_nodes_from(nodes, **self.node_defaults)
+        graph.add_edges_from(zip(edge_ends[::2], edge_ends[1::2]))
 
         return graph, checksum_num_nodes, checksum_num_edges
 
-    @staticmethod
-    def empty_graph() -> Graph:
-        """Return an empty graph.
+    def empty_graph(self) -> Graph:
+        """Return an empty graph of the same class as this graph.
 
         Returns
         -------
         Graph
             An empty graph.
         """
-        return Graph()
+        return type(self)()
 
     @staticmethod
-    def _validate_col_file_checksum(graph, checksum_num_nodes, checksum_num_edges):
+    def _validate_col_file_checksum(
+        num_nodes, num_edges, checksum_num_nodes, checksum_num_edges
+    ):
 
-        if len(graph.nodes) != checksum_num_nodes:
+        if num_nodes != checksum_num_nodes:
             raise ColFileReadError(
-                f"Number of nodes ({len(graph.nodes)}) does not match checksum ({checksum_num_nodes})"
+                f"Number of nodes ({num_nodes}) does not match checksum ({checksum_num_nodes})"
             )
 
-        if len(graph.edges) != checksum_num_edges:
+        if num_edges != checksum_num_edges:
             raise ColFileReadError(
-                f"Number of edges ({len(graph.edges)}) does not match checksum ({checksum_num_edges})"
+                f"Number of edges ({num_edges}) does not match checksum ({checksum_num_edges})"
             )
 
+    def to_csr(self) -> CSRAdjacency:
+        """Return the adjacency of the graph in compressed sparse row form. The nodes
+        are numbered in the order of self.nodes.
+
+        Returns
+        -------
+        CSRAdjacency
+            The adjacency of the graph.
+        """
+
+        # the raw adjacency dict, as looking up through the adj view is much slower
+        adjacency = self._adj
+        nodes = list(adjacency)
+        node_ids = {node: node_id for node_id, node in enumerate(nodes)}
+
+        # the neighbour dicts are walked with map and chain rather than a generator
+        # expression, so there is no Python frame per neighbour
+        neighbour_dicts = adjacency.values()
+
+        indptr = np.zeros(len(nodes) + 1, dtype=np.int32)
+        indptr[1:] = np.cumsum(list(map(len, neighbour_dicts)))
+
+        indices = np.fromiter(
+            map(node_ids.__getitem__, chain.from_iterable(neighbour_dicts)),
+            dtype=np.int32,
+            count=indptr[-1],
+        )
+
+        return CSRAdjacency(nodes, indptr, indices)
+
     def plot(
         self,
         output_folder: Path,
         positions,
         colour_map: List[str] = ["blue"],
         file_name: str = "graph.png",
+        ax: Optional[plt.Axes] = None,
     ) -> Path:
         """Plot the graph.
 
@@ -124,8 +282,16 @@ class Graph(nx.Graph):
         ----------
         output_folder : Path
             The folder to save the plot to.
+        positions : dict
+            A dictionary mapping nodes to their positions.
+        colour_map : List[str], optional
+            The colours of the nodes, by default ["blue"]
         file_name : str, optional
             The name of the file to save the plot to, by default "graph.png"
+        ax : Optional[plt.Axes], optional
+            Axes to reuse when plotting many graphs, which are cleared before
+            plotting. By default a new figure is created, and closed once saved so
+            figures do not accumulate.
 
         Returns
         -------
@@ -135,17 +301,218 @@ class Graph(nx.Graph):
 
         output_path = output_folder / file_name
 
-        nx.draw_networkx(self, positions, node_color=colour_map, with_labels=True)
+        if ax is None:
+            figure, plot_ax = plt.subplots()
+        else:
+            figure, plot_ax = ax.figure, ax
+            plot_ax.clear()
+
+        nx.draw_networkx(
+            self, positions, ax=plot_ax, node_color=colour_map, with_labels=True
+        )
 
-        plt.axis("off")
-        plt.savefig(output_path)
+        plot_ax.axis("off")
+        figure.savefig(output_path)
+
+        if ax is None:
+            plt.close(figure)
 
         return output_path
 
 
+@dataclass(frozen=True, eq=False)
+class CSRAdjacency:
+    """The adjacency of a graph in compressed sparse row form. Node i is nodes[i], and
+    its neighbours are indices[indptr[i] : indptr[i + 1]]. Unlike the dict of dicts
+    used by networkx, the edges are stored in contiguous arrays, so they can be
+    processed with numpy rather than a Python loop. The generated __eq__ and __hash__
+    would fail on the arrays and list, so adjacencies compare and hash by identity.
+    """
+
+    nodes: List[Any]
+    indptr: np.ndarray
+    indices: np.ndarray
+
+    @classmethod
+    def from_edges(cls, nodes: List[Any], edges: List[Tuple[Any, Any]]) -> CSRAdjacency:
+        """Build the adjacency from a list of nodes and edges with numpy, without
+        building a networkx graph. Duplicate edges, in either direction, are stored
+        once, and the neighbours of each node are sorted by id.
+
+        Parameters
+        ----------
+        nodes : List[Any]
+            The nodes, numbered in this order.
+        edges : List[Tuple[Any, Any]]
+            The edges, as pairs of nodes.
+
+        Returns
+        -------
+        CSRAdjacency
+            The adjacency of the graph.
+        """
+        return cls.from_edge_ends(nodes, list(chain.from_iterable(edges)))
+
+    @classmethod
+    def from_edge_ends(cls, nodes: List[Any], edge_ends: List[Any]) -> CSRAdjacency:
+        """Build the adjacency from a list of nodes and a flat list of the nodes at
+        each end of every edge, which saves pairing up the ends of edges read from
+        a file.
+
+        Parameters
+        ----------
+        nodes : List[Any]
+            The nodes, numbered in this order.
+        edge_ends : List[Any]
+            The two nodes of each edge in turn.
+
+        Returns
+        -------
+        CSRAdjacency
+            The adjacency of the graph.
+        """
+
+        num_nodes = len(nodes)
+        node_ids = {node: node_id for node_id, node in enumerate(nodes)}
+
+        ends = np.fromiter(
+            map(node_ids.__getitem__, edge_ends),
+            dtype=np.int64,
+            count=len(edge_ends),
+        ).reshape(-1, 2)
+
+        # each edge is in the rows of both its nodes, encoded as one number so
+        # the pairs can be sorted and deduplicated together
+        pairs = np.concatenate(
+            (ends[:, 0] * num_nodes + ends[:, 1], ends[:, 1] * num_nodes + ends[:, 0])
+        )
+        pairs.sort()
+        pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+        sources, indices = np.divmod(pairs, num_nodes)
+
+        indptr = np.zeros(num_nodes + 1, dtype=np.int32)
+        indptr[1:] = np.cumsum(np.bincount(sources, minlength=num_nodes))
+
+        return cls(list(nodes), indptr, indices.astype(np.int32))
+
+    @classmethod
+    def from_col_file(cls, file_name: Path) -> CSRAdjacency:
+        """Read the adjacency of a graph from a .col file, without building a
+        networkx graph. This is much faster for large graphs which are only needed
+        for the adjacency.
+
+        Parameters
+        ----------
+        file_name : Path
+            The name of the file to read.
+
+        Returns
+        -------
+        CSRAdjacency
+            The adjacency of the graph read from the file.
+        """
+
+        (
+            nodes,
+            edge_ends,
+            checksum_num_nodes,
+            checksum_num_edges,
+        ) = read_col_file(file_name)
+        csr = cls.from_edge_ends(nodes, edge_ends)
+
+        Graph._validate_col_file_checksum(
+            len(csr.nodes), len(csr.edges[0]), checksum_num_nodes, checksum_num_edges
+        )
+
+        return csr
+
+    def neighbours(self, node_id: int) -> np.ndarray:
+        """Return a view of the ids of the neighbours of a node.
+
+        Parameters
+        ----------
+        node_id : int
+            The id of the node.
+
+        Returns
+        -------
+        np.ndarray
+            The ids of the neighbours of the node.
+        """
+        return self.indices[self.indptr[node_id] : self.indptr[node_id + 1]]
+
+    def dsatur_colouring(self) -> np.ndarray:
+        """Colour the nodes greedily with the DSatur heuristic. The next node coloured
+        is the one whose neighbours already have the most distinct colours, breaking
+        ties by degree, and it is given the lowest colour none of its neighbours
+        have. No two neighbours get the same colour.
+
+        Returns
+        -------
+        np.ndarray
+            The colour of each node, numbered from 0.
+        """
+
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        degrees = np.diff(self.indptr).tolist()
+
+        colours = [-1] * len(self.nodes)
+        # bit c of a node's mask is set once one of its neighbours has colour c
+        neighbour_colour_masks = [0] * len(self.nodes)
+        saturations = [0] * len(self.nodes)
+
+        # the node with the highest saturation, then degree, is at the top. A node
+        # is pushed again each time its saturation rises, and the outdated entries
+        # are skipped as the node is already coloured by the time they are popped
+        heap = [(0, -degree, node_id) for node_id, degree in enumerate(degrees)]
+        heapify(heap)
+
+        while heap:
+            _, _, node_id = heappop(heap)
+            if colours[node_id] >= 0:
+                continue
+
+            # the lowest bit which is not set in the mask
+            mask = neighbour_colour_masks[node_id]
+            colour = (~mask & (mask + 1)).bit_length() - 1
+            colours[node_id] = colour
+
+            colour_bit = 1 << colour
+            for neighbour in indices[indptr[node_id] : indptr[node_id + 1]]:
+                if colours[neighbour] < 0 and not (
+                    neighbour_colour_masks[neighbour] & colour_bit
+                ):
+                    neighbour_colour_masks[neighbour] |= colour_bit
+                    saturations[neighbour] += 1
+                    heappush(
+                        heap, (-saturations[neighbour], -degrees[neighbour], neighbour)
+                    )
+
+        return np.array(colours, dtype=np.int32)
+
+    @cached_property
+    def edges(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The ids of the nodes at each end of every edge. Each edge is included
+        once, with the lower node id first. This is calculated on first access.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            The ids of the first and second node of each edge.
+        """
+        sources = np.repeat(
+            np.arange(len(self.nodes), dtype=np.int32), np.diff(self.indptr)
+        )
+        is_first = sources <= self.indices
+        return sources[is_first], self.indices[is_first]
+
+
 class NodeColouredGraph(Graph):
     """A graph where each node has a colour."""
 
+    node_defaults = {"colour": None}
+
     @property
     def colour_dict(self) -> dict:
         """Return a dictionary mapping nodes to their colours.
@@ -158,6 +525,25 @@ class NodeColouredGraph(Graph):
 
         return nx.get_node_attributes(self, "colour")
 
+    def copy_colours(self) -> NodeColouredGraph:
+        """Return a copy of the graph with its own node colours, which shares the
+        edges of this graph. The colours are the only part of the graph changed by
+        the genetic algorithm, so this is much cheaper than a deep copy. The edges
+        must not be changed on either graph after copying.
+
+        Returns
+        -------
+        NodeColouredGraph
+            A copy of the graph with its own node attributes.
+        """
+
+        graph = type(self)()
+        graph.graph = self.graph
+        graph._adj = self._adj
+        graph._node = {node: dict(data) for node, data in self._node.items()}
+
+        return graph
+
     def node_colour_match(self, node1: Any, node2: Any) -> bool:
         """Return true if the nodes have the same colour
 
@@ -173,12 +559,72 @@ class NodeColouredGraph(Graph):
         bool
             True if the nodes have the same colour.
         """
-        return self.nodes[node1]["colour"] == self.nodes[node2]["colour"]
+        node_data = self._node
+        return node_data[node1]["colour"] == node_data[node2]["colour"]
+
+    def colours(self, nodes: List[Any]) -> List[Any]:
+        """Return the colours of the nodes. This reads the node data dict directly
+        rather than through the nodes view, as it is called for every fitness
+        evaluation.
+
+        Parameters
+        ----------
+        nodes : List[Any]
+            The nodes to return the colours of.
+
+        Returns
+        -------
+        List[Any]
+            The colour of each node.
+        """
+        node_data = self._node
+        return [node_data[node]["colour"] for node in nodes]
+
+    def colour_ids(self, nodes: List[Any]) -> np.ndarray:
+        """Return an integer id for the colour of each node, where nodes with the
+        same colour have the same id. The colours can be any hashable values, so
+        comparing ids is much faster than comparing the colours themselves.
+
+        Parameters
+        ----------
+        nodes : List[Any]
+            The nodes to return the colour ids of.
+
+        Returns
+        -------
+        np.ndarray
+            The colour id of each node.
+        """
+        colours = self.colours(nodes)
+        # each colour is given the position of the last node with that colour
+        ids = dict(zip(colours, range(len(colours))))
+        return np.fromiter(map(ids.__getitem__, colours), np.int32, len(colours))
+
+    def count_colour_conflicts(self, csr: Optional[CSRAdjacency] = None) -> int:
+        """Return the number of edges with the same colour node at each end. The
+        colour ids of the edges are compared with numpy rather than looping over
+        them in Python.
+
+        Parameters
+        ----------
+        csr : Optional[CSRAdjacency], optional
+            The adjacency of a graph with the same nodes and edges, e.g. the graph
+            this graph was copied from, so it does not have to be rebuilt for every
+            call, by default the adjacency of this graph
+
+        Returns
+        -------
+        int
+            The number of edges with the same colour node at each end.
+        """
+
+        if csr is None:
+            csr = self.to_csr()
+
+        colour_ids = self.colour_ids(csr.nodes)
+        sources, targets = csr.edges
 
-    def from_col_file(self, file_name: Path) -> NodeColouredGraph:
-        graph = super().from_col_file(file_name)
-        nx.set_node_attributes(graph, None, "colour")
-        return NodeColouredGraph(graph)
+        return int(np.count_nonzero(colour_ids[sources] == colour_ids[targets]))
 
 
 class ColFileReadError(Exception):
@@ -1,6 +1,25 @@
 import random
 
-from src.genetic import AbsoluteFitness, Chromosome, Mutation, RelativeFitness
+import numpy as np
+
+from src.genetic import (
+    AbsoluteFitness,
+    AgeAnnealing,
+    BatchFitness,
+    Chromosome,
+    ChromosomeGenerator,
+    FitnessCache,
+    FitnessStagnationDetector,
+    Mutation,
+    Population,
+    RelativeFitness,
+    Runner,
+    StoppingCriteria,
+    genes_key,
+    run_island,
+    run_islands,
+    run_islands_with_migration,
+)
 
 
 class TestChromosome(Chromosome):
@@ -28,6 +47,8 @@ class TestAbsoluteFitness(AbsoluteFitness):
 class TestRelativeFitness(RelativeFitness):
     """A simple test RelativeFitness."""
 
+    __slots__ = ()
+
     def __gt__(self, other: RelativeFitness) -> bool:
         """A simple relative fitness. In this case a shorter chromosome is better, and
         a if chromosomes are of equal length, the older one is better
@@ -43,10 +64,11 @@ class TestRelativeFitness(RelativeFitness):
             True if self is better than other, False otherwise
         """
 
-        if len(self.chromosome.genes) == len(other.chromosome.genes):
-            return self.chromosome.age > other.chromosome.age
-        else:
-            return len(self.chromosome.genes) > len(other.chromosome.genes)
+        # the runner changes the age of a chromosome, so this is not stored
+        return (len(self.chromosome.genes), self.chromosome.age) > (
+            len(other.chromosome.genes),
+            other.chromosome.age,
+        )
 
 
 class TestMutation(Mutation):
@@ -58,7 +80,14 @@ class TestMutation(Mutation):
 
     def __call__(self, parent: TestChromosome) -> TestChromosome:
         index = 0
-        new_genes = parent.genes.replace(parent.genes[index], self.gene_set[index])
+        old_gene = parent.genes[index]
+        new_gene = self.gene_set[index]
+
+        # the genes are a string, so can be shared if the gene is unchanged
+        if old_gene == new_gene:
+            return TestChromosome(genes=parent.genes, age=parent.age)
+
+        new_genes = parent.genes.replace(old_gene, new_gene)
         return TestChromosome(genes=new_genes, age=parent.age)
 
 
@@ -115,6 +144,39 @@ def test_simple_RelativeFitness():
     assert TestRelativeFitness(chromosome_3) < TestRelativeFitness(chromosome_4)
 
 
+def test_age_changed_RelativeFitness():
+    """GIVEN relative fitnesses of two chromosomes of equal length
+    WHEN the age of a chromosome changes after its fitness is created
+    THEN the fitnesses are compared by the current age
+    """
+
+    chromosome_1 = TestChromosome(genes="abc", age=2)
+    chromosome_2 = TestChromosome(genes="abc", age=3)
+
+    fitness_1 = TestRelativeFitness(chromosome_1)
+    fitness_2 = TestRelativeFitness(chromosome_2)
+
+    assert fitness_2 > fitness_1
+
+    chromosome_1.age = 4
+
+    assert fitness_1 > fitness_2
+
+
+def test_slots_RelativeFitness():
+    """GIVEN a RelativeFitness subclass which declares empty slots
+    WHEN a fitness is created
+    THEN its chromosome is stored in a slot and it has no __dict__
+    """
+
+    chromosome = TestChromosome(genes="abc", age=2)
+
+    fitness = TestRelativeFitness(chromosome)
+
+    assert fitness.chromosome is chromosome
+    assert not hasattr(fitness, "__dict__")
+
+
 def test_call_Mutation():
     """GIVEN a simple Mutation
     WHEN a chromosome is mutated
@@ -131,3 +193,493 @@ def test_call_Mutation():
 
     assert child.genes == "dbc"
     assert child.age == 2
+
+
+def test_call_unchanged_gene_Mutation():
+    """GIVEN a simple Mutation whose new gene is the same as the parent's gene
+    WHEN a chromosome is mutated
+    THEN the child shares the parent's genes and has the parent's age
+    """
+
+    chromosome = TestChromosome(genes="abc", age=2)
+    mutation = TestMutation(TestAbsoluteFitness(value=30.0), "abcd")
+
+    child = mutation(chromosome)
+
+    assert child is not chromosome
+    assert child.genes is chromosome.genes
+    assert child.age == 2
+
+
+def test_genes_key():
+    """GIVEN genes of different types
+    WHEN genes_key is called
+    THEN equal genes have equal keys, and genes which can't be keyed return None.
+    """
+
+    genes = np.arange(6).reshape(2, 3)
+
+    assert genes_key(genes) == genes_key(genes.copy())
+    assert genes_key(genes) != genes_key(genes.reshape(3, 2))
+    assert genes_key(genes) != genes_key(genes.astype(np.int8))
+    assert genes_key("abc") == genes_key("abc")
+    assert genes_key(bytearray(b"abc")) == genes_key(b"abc")
+    assert genes_key(bytearray(b"abc")) != genes_key("abc")
+    assert genes_key([1, 2, 3]) == genes_key([1, 2, 3])
+    assert genes_key([[1, 2], [3]]) is None
+    assert genes_key({1, 2, 3}) is None
+
+
+def test_call_FitnessCache():
+    """GIVEN an absolute fitness wrapped in a FitnessCache of size 2
+    WHEN chromosomes are evaluated
+    THEN chromosomes with the same genes are only evaluated once, and the least
+    recently used fitness is evicted when the cache is full.
+    """
+
+    class CountingFitness(AbsoluteFitness):
+        def __init__(self):
+            self.num_calls = 0
+
+        def __call__(self, chromosome: TestChromosome) -> float:
+            self.num_calls += 1
+            return len(chromosome.genes)
+
+    counting_fitness = CountingFitness()
+    fitness = FitnessCache(counting_fitness, cache_size=2)
+
+    assert fitness(TestChromosome(genes="abc", age=0)) == 3
+    assert fitness(TestChromosome(genes="abc", age=1)) == 3
+    assert fitness.delta(3, TestChromosome("abc", 0), TestChromosome("abc", 2)) == 3
+    assert counting_fitness.num_calls == 1
+
+    fitness(TestChromosome(genes="ab", age=0))
+    fitness(TestChromosome(genes="a", age=0))
+    assert len(fitness.cache) == 2
+    assert "abc" not in fitness.cache
+
+    fitness.cache_clear()
+    assert len(fitness.cache) == 0
+
+
+def test_proportion_similar_AgeAnnealing():
+    """GIVEN an AgeAnnealing with historical fitnesses added out of order
+    WHEN proportion_similar is called
+    THEN the historical fitnesses are sorted, and the proportion of historical
+    fitnesses worse than the fitness is returned.
+    """
+
+    age_annealing = AgeAnnealing(age_limit=10)
+
+    for fitness in [3.0, 1.0, 4.0, 2.0]:
+        age_annealing.add_historical_fitness(fitness)
+
+    assert age_annealing.historical_fitnesses == [1.0, 2.0, 3.0, 4.0]
+    assert age_annealing.proportion_similar(0.5) == 0.0
+    assert age_annealing.proportion_similar(3.0) == 0.5
+    assert age_annealing.proportion_similar(3.5) == 0.75
+    assert age_annealing.proportion_similar(5.0) == 1.0
+
+
+def test_call_FitnessStagnationDetector():
+    """GIVEN a FitnessStagnationDetector with a generations limit of 2
+    WHEN it is called with the fitness of the chromosome passed in
+    THEN the fitness function is not called, and stagnation is detected after 2
+    generations without improvement.
+    """
+
+    class FailingFitness(AbsoluteFitness):
+        def __call__(self, chromosome: TestChromosome) -> float:
+            raise AssertionError("fitness should not be called")
+
+    detector = FitnessStagnationDetector(FailingFitness(), generations_limit=2)
+    chromosome = TestChromosome(genes="abc", age=0)
+
+    assert not detector(chromosome, 1.0)
+    assert not detector(chromosome, 2.0)
+    assert not detector(chromosome, 2.0)
+    assert detector(chromosome, 1.0)
+
+
+class OnesFitness(AbsoluteFitness):
+    """The number of ones in the genes."""
+
+    def __call__(self, chromosome: TestChromosome) -> float:
+        return chromosome.genes.count("1")
+
+
+class FlipMutation(Mutation):
+    """Flip a random gene between zero and one."""
+
+    def __call__(self, parent: TestChromosome) -> TestChromosome:
+        index = random.randrange(len(parent.genes))
+        gene = "1" if parent.genes[index] == "0" else "0"
+        genes = parent.genes[:index] + gene + parent.genes[index + 1 :]
+        return TestChromosome(genes=genes, age=parent.age)
+
+
+class ZerosGenerator(ChromosomeGenerator):
+    def __call__(self) -> TestChromosome:
+        return TestChromosome(genes="00000000", age=0)
+
+
+class AllOnes(StoppingCriteria):
+    def __call__(self, chromosome: TestChromosome, chromosome_fitness=None) -> bool:
+        return chromosome.genes == "11111111"
+
+
+class TestRunner(Runner):
+    def display(self, candidate, fitness):
+        pass
+
+
+def create_test_runner() -> TestRunner:
+    """Create a runner which evolves a string of zeros to a string of ones."""
+
+    fitness = OnesFitness()
+
+    return TestRunner(
+        ZerosGenerator(),
+        fitness,
+        AllOnes(),
+        FlipMutation(),
+        AgeAnnealing(),
+        FitnessStagnationDetector(fitness),
+    )
+
+
+def test_run_island():
+    """GIVEN a function which creates a runner
+    WHEN it is run on an island
+    THEN the best chromosome and its fitness are returned.
+    """
+
+    best, fitness = run_island(create_test_runner, seed=1)
+
+    assert best.genes == "11111111"
+    assert fitness == 8
+
+
+def test_run_islands():
+    """GIVEN a function which creates a runner
+    WHEN it is run on two islands in parallel
+    THEN the best chromosome found on either island is returned.
+    """
+
+    best = run_islands(create_test_runner, num_islands=2, seed=1)
+
+    assert best.genes == "11111111"
+
+
+def test_choose_annealing_AgeAnnealing():
+    """GIVEN an AgeAnnealing with historical fitnesses
+    WHEN choose_annealing is called
+    THEN annealing is never chosen for a fitness worse than all historical
+    fitnesses, and is sometimes chosen for a fitness better than all of them.
+    """
+
+    random.seed(1)
+
+    age_annealing = AgeAnnealing(age_limit=10)
+
+    for fitness in [1.0, 2.0, 3.0, 4.0]:
+        age_annealing.add_historical_fitness(fitness)
+
+    assert not any(age_annealing.choose_annealing(0.5) for _ in range(100))
+    assert any(age_annealing.choose_annealing(5.0) for _ in range(100))
+
+
+def test_run_evaluates_each_child_once():
+    """GIVEN a runner whose chromosomes can't be cached by their genes
+    WHEN the runner is run
+    THEN the fitness is evaluated once for the initial chromosome and once for each
+    child, so the parent and best parent fitnesses are never re-evaluated.
+    """
+
+    class CountingFitness(AbsoluteFitness):
+        def __init__(self):
+            self.num_calls = 0
+
+        def __call__(self, chromosome: TestChromosome) -> float:
+            self.num_calls += 1
+            return sum(gene == ["1"] for gene in chromosome.genes)
+
+    class ListFlipMutation(Mutation):
+        def __call__(self, parent: TestChromosome) -> TestChromosome:
+            genes = [list(gene) for gene in parent.genes]
+            index = random.randrange(len(genes))
+            genes[index] = ["1"] if genes[index] == ["0"] else ["0"]
+            return TestChromosome(genes=genes, age=parent.age)
+
+    class ListZerosGenerator(ChromosomeGenerator):
+        def __call__(self) -> TestChromosome:
+            return TestChromosome(genes=[["0"] for _ in range(8)], age=0)
+
+    class ListAllOnes(StoppingCriteria):
+        def __call__(self, chromosome: TestChromosome, chromosome_fitness=None):
+            return chromosome_fitness == 8
+
+    random.seed(1)
+
+    fitness = CountingFitness()
+    runner = TestRunner(
+        ListZerosGenerator(),
+        fitness,
+        ListAllOnes(),
+        ListFlipMutation(),
+        AgeAnnealing(age_limit=5),
+        FitnessStagnationDetector(fitness),
+    )
+
+    best = runner.run()
+
+    assert best.genes == [["1"] for _ in range(8)]
+    assert fitness.num_calls == runner.iteration_num + 1
+
+
+def test_run_RelativeFitness_age_annealing():
+    """GIVEN a runner with a relative fitness which depends on age, an age limit,
+    and a mutation which only makes worse children
+    WHEN it is run
+    THEN the fitness of the parent is of the parent itself, so sees it age.
+    """
+
+    class ShortenMutation(Mutation):
+        def __call__(self, parent: TestChromosome) -> TestChromosome:
+            return TestChromosome(genes=parent.genes[:-1], age=parent.age)
+
+    class NeverStop(StoppingCriteria):
+        def __call__(self, chromosome: TestChromosome, chromosome_fitness=None):
+            return False
+
+    random.seed(1)
+
+    runner = TestRunner(
+        ZerosGenerator(),
+        TestRelativeFitness,
+        NeverStop(),
+        ShortenMutation(),
+        AgeAnnealing(age_limit=10),
+        FitnessStagnationDetector(TestRelativeFitness),
+        max_iterations=5,
+    )
+
+    runner.run()
+
+    assert runner.parent.age == 5
+    assert runner.parent_fitness.chromosome is runner.parent
+    assert runner.parent_fitness.chromosome.age == 5
+
+
+def test_bind_callables_cache_fitness():
+    """GIVEN runners with and without cache_fitness set
+    WHEN their callables are bound
+    THEN the fitness is only wrapped in a FitnessCache when cache_fitness is set.
+    """
+
+    runner = create_test_runner()
+    runner.bind_callables()
+    assert not isinstance(runner.fitness_fn.__self__, FitnessCache)
+
+    runner = create_test_runner()
+    runner.cache_fitness = True
+    runner.bind_callables()
+    assert isinstance(runner.fitness_fn.__self__, FitnessCache)
+
+
+def test_create_children_Runner():
+    """GIVEN a runner with a batch size of 4 and a map function which records its
+    calls
+    WHEN it is run
+    THEN each batch of children is evaluated in a single call of the map function,
+    and the runner still evolves a string of ones.
+    """
+
+    map_calls = []
+
+    def recording_map(function, children):
+        map_calls.append(len(children))
+        return map(function, children)
+
+    random.seed(1)
+
+    runner = create_test_runner()
+    runner.batch_size = 4
+    runner.map_fn = recording_map
+
+    best = runner.run()
+
+    assert best.genes == "11111111"
+    assert map_calls
+    assert all(num_children == 4 for num_children in map_calls)
+    assert len(map_calls) == runner.iteration_num
+
+
+def test_create_children_cache_fitness_map_fn_Runner():
+    """GIVEN runners with cache_fitness set and a batch size of 4
+    WHEN they are run with the builtin map and with another map function
+    THEN only the builtin map evaluates the children through the fitness cache, so
+    the cache is never sent to the map function.
+    """
+
+    mapped_functions = []
+
+    def recording_map(function, children):
+        mapped_functions.append(function.func)
+        return map(function, children)
+
+    random.seed(1)
+
+    runner = create_test_runner()
+    runner.cache_fitness = True
+    runner.batch_size = 4
+    runner.map_fn = recording_map
+
+    assert runner.run().genes == "11111111"
+    assert mapped_functions
+    assert all(
+        not isinstance(function.__self__, FitnessCache) for function in mapped_functions
+    )
+
+    runner = create_test_runner()
+    runner.cache_fitness = True
+    runner.bind_callables()
+
+    assert isinstance(runner.fitness_map_delta_fn.__self__, FitnessCache)
+
+
+def test_add_Population():
+    """GIVEN a full population of size 2
+    WHEN chromosomes are added
+    THEN a chromosome only replaces the least fit member if it is more fit.
+    """
+
+    population = Population(size=2)
+    assert population.add(TestChromosome(genes="a", age=0), 1.0)
+    assert population.add(TestChromosome(genes="b", age=0), 3.0)
+
+    assert not population.add(TestChromosome(genes="c", age=0), 1.0)
+    assert population.add(TestChromosome(genes="d", age=0), 2.0)
+
+    assert sorted(
+        (chromosome.genes, fitness) for chromosome, fitness in population.members
+    ) == [("b", 3.0), ("d", 2.0)]
+
+
+def test_select_Population():
+    """GIVEN a population with a fit and an unfit chromosome
+    WHEN members are selected with a high selection pressure
+    THEN the fit chromosome is selected far more often.
+    """
+
+    random.seed(1)
+
+    population = Population(size=2, selection_pressure=2.0)
+    population.add(TestChromosome(genes="unfit", age=0), 0.0)
+    population.add(TestChromosome(genes="fit", age=0), 2.0)
+
+    selected = [population.select()[0].genes for _ in range(1000)]
+
+    # the weights are exp(-4) and 1, so the unfit chromosome is picked ~2% of the time
+    assert 0 < selected.count("unfit") < 50
+
+
+def test_run_Population():
+    """GIVEN a runner with a population
+    WHEN it is run
+    THEN it still evolves a string of ones.
+    """
+
+    random.seed(1)
+
+    runner = create_test_runner()
+    runner.population = Population(size=4)
+
+    best = runner.run()
+
+    assert best.genes == "11111111"
+    assert len(runner.population.members) == 4
+
+
+def test_run_max_iterations_Runner():
+    """GIVEN a runner with an iteration limit
+    WHEN it is run
+    THEN it stops at the limit and returns the best chromosome found so far.
+    """
+
+    random.seed(1)
+
+    runner = create_test_runner()
+    runner.max_iterations = 2
+
+    best = runner.run()
+
+    assert runner.iteration_num == 2
+    assert best is runner.best_parent
+
+
+def test_run_initial_chromosome_Runner():
+    """GIVEN a runner and a chromosome which meets the stopping criteria
+    WHEN the runner is run starting from the chromosome
+    THEN a copy of the chromosome is returned without any iterations.
+    """
+
+    initial_chromosome = TestChromosome(genes="11111111", age=0)
+
+    runner = create_test_runner()
+    best = runner.run(initial_chromosome)
+
+    assert best.genes == "11111111"
+    assert best is not initial_chromosome
+    assert runner.iteration_num == 0
+
+
+def test_run_islands_with_migration():
+    """GIVEN a function which creates a runner
+    WHEN it is run on two islands which migrate every 3 iterations
+    THEN the best chromosome found on either island is returned.
+    """
+
+    best = run_islands_with_migration(
+        create_test_runner,
+        num_islands=2,
+        migration_interval=3,
+        num_migrations=20,
+        seed=1,
+    )
+
+    assert best.genes == "11111111"
+
+
+def test_create_children_BatchFitness():
+    """GIVEN a runner with a batch size of 4 and a batch fitness
+    WHEN it is run
+    THEN each batch of children is evaluated in a single call of evaluate_batch.
+    """
+
+    class OnesBatchFitness(BatchFitness):
+        def __init__(self):
+            self.batch_sizes = []
+
+        def evaluate_batch(self, chromosomes):
+            self.batch_sizes.append(len(chromosomes))
+            return np.array([chromosome.genes.count("1") for chromosome in chromosomes])
+
+    random.seed(1)
+
+    fitness = OnesBatchFitness()
+    runner = TestRunner(
+        ZerosGenerator(),
+        fitness,
+        AllOnes(),
+        FlipMutation(),
+        AgeAnnealing(),
+        FitnessStagnationDetector(fitness),
+        batch_size=4,
+    )
+
+    best = runner.run()
+
+    assert best.genes == "11111111"
+    # the initial chromosome is evaluated on its own, then one batch per iteration
+    assert fitness.batch_sizes == [1] + [4] * runner.iteration_num
@@ -1,7 +1,8 @@
 import networkx as nx
 import pytest
+from matplotlib import pyplot as plt
 
-from src.graph import Graph, NodeColouredGraph
+from src.graph import CSRAdjacency, Graph, NodeColouredGraph, read_col_file
 
 
 @pytest.fixture
@@ -60,6 +61,41 @@ def test_add_edge_Graph():
     assert ("a", 1) in graph.edges
 
 
+def test_set_node_attribute_Graph():
+    """GIVEN a graph with several nodes
+    WHEN an attribute of one node is set
+    THEN only that node has the attribute, and a missing node raises an error
+    """
+
+    graph = Graph()
+    graph.add_nodes_from([1, 2, 3])
+
+    graph.set_node_attribute(2, "colour", "red")
+
+    assert graph.nodes[2]["colour"] == "red"
+    assert "colour" not in graph.nodes[1]
+    assert "colour" not in graph.nodes[3]
+
+    with pytest.raises(ValueError):
+        graph.set_node_attribute(4, "colour", "red")
+
+
+def test_set_node_attributes_bulk_Graph():
+    """GIVEN a graph with several nodes
+    WHEN an attribute of some nodes is set in bulk
+    THEN only those nodes have the attribute
+    """
+
+    graph = Graph()
+    graph.add_nodes_from([1, 2, 3])
+
+    graph.set_node_attributes_bulk({1: "red", 3: "blue"}, "colour")
+
+    assert graph.nodes[1]["colour"] == "red"
+    assert "colour" not in graph.nodes[2]
+    assert graph.nodes[3]["colour"] == "blue"
+
+
 def test_adj_Graph():
     """GIVEN a graph with several nodes and edges
     WHEN the adjacency list is accessed
@@ -99,6 +135,75 @@ def test_from_col_file_states_Graph(adjacent_states_col_file):
     assert len(graph.edges) == 107
 
 
+def test_from_col_file_node_lines_Graph(temp_folder):
+    """GIVEN a col file with comments, edges and a node without any edges
+    WHEN a graph is created using the col file
+    THEN the nodes are added in the order they first appear in the file
+    """
+    col_file = temp_folder / "nodes.col"
+    col_file.write_text("c a comment\np edge 4 2\ne b a\nn d\ne a c\n")
+
+    graph = Graph().from_col_file(col_file)
+
+    assert list(graph.nodes) == ["b", "a", "d", "c"]
+    assert list(graph.edges) == [("b", "a"), ("a", "c")]
+
+
+def test_from_col_file_unknown_line_Graph(temp_folder):
+    """GIVEN a col file with a line of an unknown type
+    WHEN a graph is created using the col file
+    THEN a ValueError is raised
+    """
+    col_file = temp_folder / "unknown.col"
+    col_file.write_text("p edge 2 1\ne a b\nx a b\n")
+
+    with pytest.raises(ValueError):
+        Graph().from_col_file(col_file)
+
+
+def test_from_col_file_short_edge_line_Graph(temp_folder):
+    """GIVEN a col file with an edge line which has only one node
+    WHEN a graph is created using the col file
+    THEN a ValueError is raised
+    """
+    col_file = temp_folder / "short_edge.col"
+    col_file.write_text("p edge 2 2\ne a b\ne a\n")
+
+    with pytest.raises(ValueError):
+        Graph().from_col_file(col_file)
+
+
+def test_from_col_file_long_and_short_edge_lines_Graph(temp_folder):
+    """GIVEN a col file with an edge line which has three nodes and another which has
+    only one node
+    WHEN a graph is created using the col file
+    THEN a ValueError is raised
+    """
+    col_file = temp_folder / "long_and_short_edge.col"
+    col_file.write_text("p edge 4 2\ne a b c\ne d\n")
+
+    with pytest.raises(ValueError, match="e a b c"):
+        Graph().from_col_file(col_file)
+
+
+def test_read_col_file(temp_folder):
+    """GIVEN a col file which is read twice, then changed
+    WHEN it is read again
+    THEN the second read comes from the cache, and the changed file is read anew
+    """
+    col_file = temp_folder / "cached.col"
+    col_file.write_text("p edge 2 1\ne a b\n")
+
+    first_read = read_col_file(col_file)
+
+    assert read_col_file(col_file) is first_read
+
+    col_file.write_text("p edge 3 2\ne a b\ne b c\n")
+
+    assert read_col_file(col_file) == (["a", "b", "c"], ["a", "b", "b", "c"], 3, 2)
+    assert len(Graph().from_col_file(col_file).edges) == 2
+
+
 def test_plot_simple_Graph(simple_col_file, temp_folder):
     """GIVEN a simple graph
     WHEN the graph is plotted
@@ -124,6 +229,27 @@ def test_plot_states_Graph(adjacent_states_col_file, temp_folder):
     assert output_path.exists()
 
 
+def test_plot_reuse_axes_Graph(simple_col_file, temp_folder):
+    """GIVEN a simple graph and an existing figure
+    WHEN the graph is plotted twice on the figure's axes
+    THEN both files are created and no new figures are opened
+    """
+    graph = Graph().from_col_file(simple_col_file)
+    positions = nx.planar_layout(graph)
+
+    figure, ax = plt.subplots()
+    num_figures = len(plt.get_fignums())
+
+    first_path = graph.plot(temp_folder, positions, file_name="first.png", ax=ax)
+    second_path = graph.plot(temp_folder, positions, file_name="second.png", ax=ax)
+
+    assert first_path.exists()
+    assert second_path.exists()
+    assert len(plt.get_fignums()) == num_figures
+
+    plt.close(figure)
+
+
 def test_from_col_file_NodeColouredGraph(simple_col_file):
     """GIVEN a col file for a simple graph
     WHEN a graph is created using the col file
@@ -131,6 +257,7 @@ def test_from_col_file_NodeColouredGraph(simple_col_file):
     """
     graph = NodeColouredGraph().from_col_file(simple_col_file)
 
+    assert isinstance(graph, NodeColouredGraph)
     assert len(graph.nodes) == 5
     assert len(graph.edges) == 9
 
@@ -139,3 +266,121 @@ def test_from_col_file_NodeColouredGraph(simple_col_file):
     assert graph.nodes["3"]["colour"] == None
     assert graph.nodes["4"]["colour"] == None
     assert graph.nodes["5"]["colour"] == None
+
+
+def test_to_csr_Graph():
+    """GIVEN a graph with a self loop
+    WHEN it is converted to compressed sparse row form
+    THEN the neighbours of each node and the edges are correct
+    """
+    graph = Graph()
+    graph.add_edges_from([("a", "b"), ("b", "c"), ("c", "c")])
+
+    csr = graph.to_csr()
+
+    assert csr.nodes == ["a", "b", "c"]
+    assert csr.neighbours(0).tolist() == [1]
+    assert csr.neighbours(1).tolist() == [0, 2]
+    assert csr.neighbours(2).tolist() == [1, 2]
+
+    sources, targets = csr.edges
+    assert list(zip(sources.tolist(), targets.tolist())) == [(0, 1), (1, 2), (2, 2)]
+
+
+def test_colour_ids_NodeColouredGraph(simple_col_file):
+    """GIVEN a coloured graph
+    WHEN the colour ids of its nodes are found
+    THEN nodes have the same id exactly when they have the same colour
+    """
+    graph = NodeColouredGraph().from_col_file(simple_col_file)
+    colours = ["red", "blue", "red", None, "blue"]
+    graph.set_node_attributes_bulk(dict(zip(graph.nodes, colours)), "colour")
+
+    colour_ids = graph.colour_ids(list(graph.nodes)).tolist()
+
+    for id1, colour1 in zip(colour_ids, colours):
+        for id2, colour2 in zip(colour_ids, colours):
+            assert (id1 == id2) == (colour1 == colour2)
+
+
+def test_count_colour_conflicts_NodeColouredGraph(adjacent_states_col_file):
+    """GIVEN a coloured graph and a copy with its adjacency
+    WHEN the colour conflicts are counted
+    THEN they match the number of edges with the same colour at each end
+    """
+    graph = NodeColouredGraph().from_col_file(adjacent_states_col_file)
+    csr = graph.to_csr()
+
+    for ii, node in enumerate(graph.nodes):
+        graph.nodes[node]["colour"] = ["red", "blue", "green"][ii % 3]
+
+    expected = sum(
+        graph.node_colour_match(node1, node2) for node1, node2 in graph.edges
+    )
+
+    assert graph.count_colour_conflicts() == expected
+    assert graph.copy().count_colour_conflicts(csr) == expected
+
+
+def test_copy_colours_NodeColouredGraph(simple_col_file):
+    """GIVEN a coloured graph
+    WHEN its colours are copied and the copy is recoloured
+    THEN the copy has the same edges, and the original colours are unchanged
+    """
+    graph = NodeColouredGraph().from_col_file(simple_col_file)
+    graph.set_node_attribute("1", "colour", "red")
+
+    copy = graph.copy_colours()
+    copy.set_node_attribute("1", "colour", "blue")
+
+    assert isinstance(copy, NodeColouredGraph)
+    assert list(copy.edges) == list(graph.edges)
+    assert graph.nodes["1"]["colour"] == "red"
+    assert copy.nodes["1"]["colour"] == "blue"
+
+
+def test_dsatur_colouring_CSRAdjacency(simple_col_file, adjacent_states_col_file):
+    """GIVEN the adjacency of the simple graph, which is five nodes with one edge
+    missing, and of the states graph
+    WHEN they are coloured with DSatur
+    THEN no edge has the same colour at each end, and both use four colours
+    """
+    for col_file in (simple_col_file, adjacent_states_col_file):
+        csr = CSRAdjacency.from_col_file(col_file)
+
+        colours = csr.dsatur_colouring()
+        sources, targets = csr.edges
+
+        assert not (colours[sources] == colours[targets]).any()
+        assert sorted(set(colours.tolist())) == [0, 1, 2, 3]
+
+
+def test_from_col_file_CSRAdjacency(adjacent_states_col_file):
+    """GIVEN a col file which lists each edge in both directions
+    WHEN the adjacency is read directly from the col file
+    THEN it has the same nodes and neighbours as the adjacency of the graph
+    """
+    csr = CSRAdjacency.from_col_file(adjacent_states_col_file)
+    expected = Graph().from_col_file(adjacent_states_col_file).to_csr()
+
+    assert csr.nodes == expected.nodes
+    assert csr.indptr.tolist() == expected.indptr.tolist()
+    assert len(csr.edges[0]) == 107
+
+    for node_id in range(len(csr.nodes)):
+        assert csr.neighbours(node_id).tolist() == sorted(
+            expected.neighbours(node_id).tolist()
+        )
+
+
+def test_eq_hash_CSRAdjacency(simple_col_file):
+    """GIVEN two adjacencies read from the same col file
+    WHEN they are compared and hashed
+    THEN they compare and hash by identity rather than raising on the arrays
+    """
+    csr = CSRAdjacency.from_col_file(simple_col_file)
+    other = CSRAdjacency.from_col_file(simple_col_file)
+
+    assert csr == csr
+    assert csr != other
+    assert len({csr, other}) == 2
@@ -0,0 +1,48 @@
+import statistics
+import sys
+
+from src import timing
+from src.timing import Benchmark
+
+
+def test_run_Benchmark(monkeypatch, capsys):
+    """GIVEN a function which prints and takes a known time on each run
+    WHEN it is benchmarked
+    THEN its output is discarded, and the mean and standard deviation printed
+    match those of the timings
+    """
+
+    durations = [0.1 * (1 + ii % 7) for ii in range(100)]
+    clock = iter([t for ii in range(100) for t in (0, (1 + ii % 7) * 100_000_000)])
+    monkeypatch.setattr(timing.time, "perf_counter_ns", lambda: next(clock))
+
+    def function():
+        print("discarded")
+        sys.stdout.write("discarded\n")
+
+    Benchmark.run(function)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 19
+
+    for line in lines:
+        num_runs, mean, stdev = line.split()
+        num_runs = int(num_runs)
+        timings = durations[:num_runs]
+
+        expected_stdev = statistics.stdev(timings) if num_runs > 2 else 0
+        # printed to 2 decimal places
+        assert abs(float(mean) - statistics.mean(timings)) <= 0.005 + 1e-9
+        assert abs(float(stdev) - expected_stdev) <= 0.005 + 1e-9
+
+
+def test_run_parallel_Benchmark(capsys):
+    """GIVEN a function which can be pickled
+    WHEN it is benchmarked in parallel for a given number of runs
+    THEN the statistics are printed after the first 10 runs and every 10th run
+    """
+
+    Benchmark.run(int, num_runs=25, parallel=True)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [int(line.split()[0]) for line in lines] == list(range(1, 11)) + [20]
@@ -1,24 +1,72 @@
-import statistics
+import math
+import multiprocessing
+import os
 import sys
 import time
+from contextlib import redirect_stdout
+
+NUM_RUNS = 100
+
+
+def _discard_stdout():
+    """Discard everything printed by a benchmark worker process."""
+    sys.stdout = open(os.devnull, "w")
+
+
+def _time_run(function) -> int:
+    """Return the time taken to call the function, in nanoseconds."""
+    start_ns = time.perf_counter_ns()
+    function()
+    return time.perf_counter_ns() - start_ns
 
 
 class Benchmark:
     @staticmethod
-    def run(function):
-        timings = []
-        stdout = sys.stdout
-        for i in range(100):
-            sys.stdout = None
-            startTime = time.time()
-            function()
-            seconds = time.time() - startTime
-            sys.stdout = stdout
-            timings.append(seconds)
-            mean = statistics.mean(timings)
+    def run(function, num_runs: int = NUM_RUNS, parallel: bool = False):
+        """Call the function repeatedly, discarding its output, and print the mean
+        and standard deviation of its run time in seconds after the first 10 runs
+        and every 10th run after that.
+
+        Parameters
+        ----------
+        function : Callable[[], Any]
+            The function to time.
+        num_runs : int, optional
+            The number of times to call the function, by default NUM_RUNS
+        parallel : bool, optional
+            Whether to spread the runs over a process per CPU, by default False.
+            This only gives the same timings if the function is CPU bound, doesn't
+            depend on state shared between runs, and can be pickled.
+        """
+
+        if parallel:
+            with multiprocessing.Pool(initializer=_discard_stdout) as pool:
+                elapsed_ns = pool.map(_time_run, [function] * num_runs)
+        else:
+            # the function's output is discarded for the whole run rather than
+            # around each call, and nothing else is done between calls, so printing
+            # the statistics doesn't add to the time of the next call
+            elapsed_ns = [0] * num_runs
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                for i in range(num_runs):
+                    start_ns = time.perf_counter_ns()
+                    function()
+                    elapsed_ns[i] = time.perf_counter_ns() - start_ns
+
+        # running mean and sum of squared differences from the mean (Welford's
+        # algorithm), so each timing is added in constant time
+        mean = 0.0
+        sum_squared_differences = 0.0
+        for i, run_ns in enumerate(elapsed_ns):
+            seconds = run_ns / 1e9
+            difference = seconds - mean
+            mean += difference / (i + 1)
+            sum_squared_differences += difference * (seconds - mean)
             if i < 10 or i % 10 == 9:
                 print(
                     "{} {:3.2f} {:3.2f}".format(
-                        1 + i, mean, statistics.stdev(timings, mean) if i > 1 else 0
+                        1 + i,
+                        mean,
+                        math.sqrt(sum_squared_differences / i) if i > 1 else 0,
                     )
                 )